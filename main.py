@@ -1,1401 +1,2895 @@
-import os
-import shutil
-import math
-import random
-from pathlib import Path
-import glob
-import numpy as np
-from PIL import Image
-import pygame
-import moviepy.editor as mpy
-from moviepy.audio.AudioClip import AudioClip
-import requests
-import cv2
-import matplotlib.pyplot as plt
-
-# =========================
-# Configuration centralisée
-# =========================
-
-def generate_viral_filename():
-    """Génère un nom de fichier accrocheur et aléatoire pour la vidéo."""
-    prefixes = [
-        "🔥", "⚡", "💥", "🎯", "🚀", "💎", "👑", "🎪", "🎭", "🎨", "🎬", "🎤", "🎧", "🎮", "🏆", "🥇", "💫", "⭐", "🌟", "✨"
-    ]
-    
-    adjectives = [
-        "VIRAL", "EPIC", "LEGENDARY", "INSANE", "CRAZY", "AMAZING", "INCREDIBLE", "MIND_BLOWING", 
-        "HYPERTROPHIC", "MEGA", "ULTRA", "SUPER", "EXTREME", "WILD", "SICK", "LIT", "FIRE", 
-        "BOMBASTIC", "PHENOMENAL", "SPECTACULAR", "MAGNIFICENT", "ASTRONOMICAL", "COSMIC", 
-        "INTERGALACTIC", "QUANTUM", "NUCLEAR", "ATOMIC", "EXPLOSIVE", "DYNAMITE", "THUNDER"
-    ]
-    
-    nouns = [
-        "BATTLE", "SHOWDOWN", "CLASH", "DUEL", "WAR", "FIGHT", "COMBAT", "CONFLICT", "RIVALRY",
-        "CHALLENGE", "COMPETITION", "TOURNAMENT", "CHAMPIONSHIP", "MATCH", "GAME", "PLAYOFF",
-        "FINALS", "SEMIFINALS", "QUARTERFINALS", "ELIMINATION", "SURVIVAL", "DESTINY", "FATE",
-        "LEGACY", "DESTINY", "JOURNEY", "ADVENTURE", "QUEST", "MISSION", "EXPEDITION"
-    ]
-    
-    suffixes = [
-        "2024", "2025", "V2", "PRO", "MAX", "PLUS", "ULTIMATE", "DEFINITIVE", "FINAL", "REMASTERED",
-        "ENHANCED", "UPGRADED", "PREMIUM", "DELUXE", "COLLECTOR", "SPECIAL", "EXCLUSIVE", "LIMITED",
-        "RARE", "LEGENDARY", "MYTHICAL", "DIVINE", "CELESTIAL", "ETERNAL", "INFINITE", "ABSOLUTE"
-    ]
-    
-    prefix = random.choice(prefixes)
-    adjective = random.choice(adjectives)
-    noun = random.choice(nouns)
-    suffix = random.choice(suffixes)
-    
-    # Ajouter un timestamp pour garantir l'unicité
-    timestamp = f"{random.randint(1000, 9999)}"
-    
-    return f"{prefix}_{adjective}_{noun}_{suffix}_{timestamp}.mp4"
-
-class Config:
-    WIDTH, HEIGHT = 720, 1280
-    FPS = 50
-    DURATION = 10
-    TITLE_DURATION = 2
-    FRAMES_DIR = Path("frames_tmp")
-    COLORS = {
-        'background': (15, 15, 35),
-        'p1': (255, 100, 100),
-        'p2': (100, 100, 255),
-        'text': (255, 255, 255),
-        'accent': (255, 215, 0)
-    }
-    # Effets visuels
-    HALO = True
-    ZOOM = True
-    SHAKE = True
-    FLASH = True
-    PARTICLE_BOOST = True
-    COLORFUL_PARTICLES = True
-    SCORE_PULSE = True
-    ULTRA_FAST = True
-    SHAKE_INTENSITY = 18
-    FLASH_INTENSITY = 180
-    SCORE_FLASH_DURATION = 12
-    WIN_SCORE = 10
-    
-    @property
-    def OUTPUT_FILE(self):
-        return generate_viral_filename()
-
-CFG = Config()
-
-# =========================
-# Utilitaires images et polices
-# =========================
-def find_two_images():
-    imgs = sorted(glob.glob("*.png"))
-    if len(imgs) < 2:
-        raise FileNotFoundError("Il faut au moins deux images PNG dans le dossier !")
-    return imgs[:2]
-
-def download_wikimedia_image(query, filename):
-    """Essaye plusieurs variantes de recherche sur Wikimedia Commons pour maximiser les chances de trouver une image."""
-    variants = [
-        query, 
-        query + " portrait", 
-        query + " face", 
-        query + " headshot",
-        query.split()[0] + " " + query.split()[-1] if len(query.split()) > 1 else query.split()[0],
-        query.split()[0]
-    ]
-    
-    for v in variants:
-        url = (
-            "https://commons.wikimedia.org/w/api.php?"
-            "action=query&format=json&prop=imageinfo&generator=search&gsrsearch="
-            + requests.utils.quote(v) +
-            "&gsrlimit=3&iiprop=url|size|mime"
-        )
-        try:
-            print(f"    🔍 Recherche Wikimedia: {v}")
-            r = requests.get(url, timeout=10)
-            data = r.json()
-            pages = data.get('query', {}).get('pages', {})
-            
-            for page in pages.values():
-                if 'imageinfo' in page:
-                    img_info = page['imageinfo'][0]
-                    img_url = img_info['url']
-                    
-                    # Vérifier que c'est une image de taille raisonnable
-                    if 'size' in img_info and img_info['size'] > 10000:  # Au moins 10KB
-                        print(f"    📥 Téléchargement depuis: {img_url}")
-                        img_data = requests.get(img_url, timeout=10).content
-                        
-                        # Convertir en PNG avec PIL pour s'assurer du bon format
-                        from PIL import Image
-                        import io
-                        img = Image.open(io.BytesIO(img_data)).convert('RGBA')
-                        img = img.resize((400, 400), Image.Resampling.LANCZOS)
-                        img.save(filename, 'PNG')
-                        print(f"    ✅ Image sauvegardée: {filename}")
-                        return True
-        except Exception as e:
-            print(f"    ❌ Erreur Wikimedia {v}: {e}")
-            continue
+import os
+import io
+import sys
+import importlib.util
+import shutil
+import math
+import bisect
+import time
+import random
+import hashlib
+import zlib
+from pathlib import Path
+import glob
+import json
+import argparse
+import threading
+import queue
+import subprocess
+import wave
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, as_completed, TimeoutError as FutureTimeout
+import multiprocessing
+import numpy as np
+from PIL import Image
+
+def _lazy_import(name):
+    """Importe un module lourd à la première utilisation d'un de ses attributs."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+def _preload(*modules):
+    """Charge réellement des modules paresseux dans le thread appelant.
+
+    LazyLoader n'est pas thread-safe avant Python 3.12 : un module chargé pour la
+    première fois par plusieurs threads à la fois peut être vu à moitié initialisé.
+    """
+    for module in modules:
+        getattr(module, '__name__')
+
+# pygame, requests et OpenCV ne sont chargés que par les modes qui s'en servent
+pygame = _lazy_import("pygame")
+requests = _lazy_import("requests")
+cv2 = _lazy_import("cv2")
+
+# =========================
+# Configuration centralisée
+# =========================
+
+def generate_viral_filename(rng=random):
+    """Génère un nom de fichier accrocheur et aléatoire pour la vidéo (tirages dans `rng`)."""
+    prefixes = [
+        "🔥", "⚡", "💥", "🎯", "🚀", "💎", "👑", "🎪", "🎭", "🎨", "🎬", "🎤", "🎧", "🎮", "🏆", "🥇", "💫", "⭐", "🌟", "✨"
+    ]
+    
+    adjectives = [
+        "VIRAL", "EPIC", "LEGENDARY", "INSANE", "CRAZY", "AMAZING", "INCREDIBLE", "MIND_BLOWING", 
+        "HYPERTROPHIC", "MEGA", "ULTRA", "SUPER", "EXTREME", "WILD", "SICK", "LIT", "FIRE", 
+        "BOMBASTIC", "PHENOMENAL", "SPECTACULAR", "MAGNIFICENT", "ASTRONOMICAL", "COSMIC", 
+        "INTERGALACTIC", "QUANTUM", "NUCLEAR", "ATOMIC", "EXPLOSIVE", "DYNAMITE", "THUNDER"
+    ]
+    
+    nouns = [
+        "BATTLE", "SHOWDOWN", "CLASH", "DUEL", "WAR", "FIGHT", "COMBAT", "CONFLICT", "RIVALRY",
+        "CHALLENGE", "COMPETITION", "TOURNAMENT", "CHAMPIONSHIP", "MATCH", "GAME", "PLAYOFF",
+        "FINALS", "SEMIFINALS", "QUARTERFINALS", "ELIMINATION", "SURVIVAL", "DESTINY", "FATE",
+        "LEGACY", "DESTINY", "JOURNEY", "ADVENTURE", "QUEST", "MISSION", "EXPEDITION"
+    ]
+    
+    suffixes = [
+        "2024", "2025", "V2", "PRO", "MAX", "PLUS", "ULTIMATE", "DEFINITIVE", "FINAL", "REMASTERED",
+        "ENHANCED", "UPGRADED", "PREMIUM", "DELUXE", "COLLECTOR", "SPECIAL", "EXCLUSIVE", "LIMITED",
+        "RARE", "LEGENDARY", "MYTHICAL", "DIVINE", "CELESTIAL", "ETERNAL", "INFINITE", "ABSOLUTE"
+    ]
+    
+    prefix = rng.choice(prefixes)
+    adjective = rng.choice(adjectives)
+    noun = rng.choice(nouns)
+    suffix = rng.choice(suffixes)
+    
+    # Ajouter un timestamp pour garantir l'unicité
+    timestamp = f"{rng.randint(1000, 9999)}"
+    
+    return f"{prefix}_{adjective}_{noun}_{suffix}_{timestamp}.mp4"
+
+class Config:
+    WIDTH, HEIGHT = 720, 1280
+    FPS = 50
+    DURATION = 10
+    TITLE_DURATION = 2
+    FRAMES_DIR = Path("frames_tmp")
+    COLORS = {
+        'background': (15, 15, 35),
+        'p1': (255, 100, 100),
+        'p2': (100, 100, 255),
+        'text': (255, 255, 255),
+        'accent': (255, 215, 0)
+    }
+    # Effets visuels
+    HALO = True
+    ZOOM = True
+    SHAKE = True
+    FLASH = True
+    PARTICLE_BOOST = True
+    COLORFUL_PARTICLES = True
+    SCORE_PULSE = True
+    ULTRA_FAST = True
+    SHAKE_INTENSITY = 18
+    FLASH_INTENSITY = 180
+    SCORE_FLASH_DURATION = 12
+    PARTICLE_SCALE = 1  # multiplicateur du nombre de particules émises
+    WIN_SCORE = 10
+    # Cache disque des portraits (clé = requête normalisée + taille cible)
+    PORTRAIT_SIZE = (400, 400)
+    CACHE_DIR = Path("portrait_cache")
+    CACHE_MAX_BYTES = 256 * 1024 * 1024
+    # Acquisition concurrente : délai max d'une course entre sources (secondes)
+    ACQUIRE_TIMEOUT = 60
+    # Session HTTP partagée : en-têtes, délais (connexion, lecture), retries, pool
+    HTTP_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate',
+        'DNT': '1',
+    }
+    HTTP_IMAGE_ACCEPT = 'image/webp,image/apng,image/*,*/*;q=0.8'
+    HTTP_TIMEOUT = (5, 15)
+    HTTP_RETRIES = 3
+    HTTP_BACKOFF = 0.5
+    HTTP_POOL_HOSTS = 8
+    HTTP_POOL_SIZE = 16
+    # Taille max d'une image téléchargée (octets) ; au-delà le transfert est abandonné
+    MAX_IMAGE_BYTES = 8 * 1024 * 1024
+    # Pack hors-ligne de portraits (construit par `python main.py prefetch`)
+    PACK_PATH = Path("portraits_pack.npy")
+    OFFLINE = os.environ.get("TIKTOK_OFFLINE") == "1"
+    # Chemins de polices résolus une fois pour toutes (évite le scan des polices système)
+    FONT_CACHE = Path(".font_cache.json")
+    # Nombre max de textes pré-rendus gardés en mémoire (scores, noms, titres...)
+    TEXT_CACHE_SIZE = 256
+    # Audio hors-ligne : musique + bruitages synthétisés puis muxés dans la vidéo
+    AUDIO = True
+    AUDIO_RATE = 44100
+    AUDIO_BLOCK = 1 << 16  # échantillons synthétisés par bloc
+    MUSIC_GAIN = 0.6
+    SFX_GAIN = 0.8
+    # Recherche de graine : matchs simulés sans rendu avant de choisir celui à filmer (0 = désactivé)
+    SEED_CANDIDATES = 4096
+    # Mode cartoon (5 couples puis défilé des bébés)
+    CARTOON_FPS = 50
+    CARTOON_DURATION = 63
+    # Frames en vol entre le rendu et le thread d'encodage (tampons recyclés)
+    PIPELINE_DEPTH = 4
+    # Encodeur vidéo : "auto" (ffmpeg si présent, sinon OpenCV), "ffmpeg" ou "opencv"
+    VIDEO_ENCODER = "auto"
+    VIDEO_CODEC = "libx264"
+    VIDEO_PRESET = "veryfast"
+    VIDEO_CRF = 23
+    VIDEO_THREADS = 0  # 0 = ffmpeg choisit selon les cœurs disponibles
+    # Plans fixes du cartoon encodés comme une seule frame tenue (vidéo à fréquence variable)
+    VIDEO_HOLD = True
+    # Rendu découpé en segments rendus par autant de processus (duel et cartoon ; 1 = rendu en série)
+    RENDER_WORKERS = 1
+    
+    @property
+    def OUTPUT_FILE(self):
+        return generate_viral_filename()
+
+CFG = Config()
+
+# =========================
+# Utilitaires images et polices
+# =========================
+def find_two_images():
+    imgs = sorted(glob.glob("*.png"))
+    if len(imgs) < 2:
+        raise FileNotFoundError("Il faut au moins deux images PNG dans le dossier !")
+    return imgs[:2]
+
+def normalize_query(query):
+    """Normalise un nom de personnalité (casse, espaces) pour l'utiliser comme clé."""
+    return " ".join(query.lower().split())
+
+class PortraitCache:
+    """Cache disque adressé par contenu des portraits déjà redimensionnés en RGBA.
+
+    Chaque entrée est un PNG nommé d'après le hash de (requête normalisée, taille).
+    La date de modification sert d'horloge LRU : elle est rafraîchie à chaque lecture,
+    et les entrées les plus anciennes sont supprimées dès que le budget est dépassé.
+    """
+    def __init__(self, root, max_bytes):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    def _path(self, query, size):
+        key = f"{normalize_query(query)}|{size[0]}x{size[1]}"
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return self.root / digest[:2] / f"{digest}.png"
+
+    def lookup(self, query, size):
+        """Retourne le chemin de l'entrée en cache (et la marque comme récente), ou None."""
+        path = self._path(query, size)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def fetch(self, query, filename, size):
+        """Copie le portrait en cache vers `filename`. Retourne True en cas de succès."""
+        path = self.lookup(query, size)
+        if path is None:
+            return False
+        try:
+            shutil.copyfile(path, filename)
+        except OSError:
+            return False
+        print(f"    💾 Portrait en cache pour {query}: {filename}")
+        return True
+
+    def store(self, query, img, size):
+        """Ajoute une image PIL déjà redimensionnée au cache puis applique le budget."""
+        path = self._path(query, size)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp")
+            img.save(tmp, 'PNG')
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"    ⚠️  Impossible d'écrire dans le cache: {e}")
+            return
+        self.evict()
+
+    def evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de `max_bytes`."""
+        entries = []
+        total = 0
+        for path in self.root.glob("*/*.png"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+
+PORTRAIT_CACHE = PortraitCache(CFG.CACHE_DIR, CFG.CACHE_MAX_BYTES)
+
+def save_portrait(img_data, query, filename):
+    """Décode une image téléchargée, la redimensionne, l'écrit dans `filename` et la met en cache."""
+    img = Image.open(io.BytesIO(img_data))
+    # JPEG : décodage directement à échelle réduite (1/2, 1/4, 1/8) avant le redimensionnement
+    img.draft('RGB', CFG.PORTRAIT_SIZE)
+    img = img.convert('RGBA').resize(CFG.PORTRAIT_SIZE, Image.Resampling.LANCZOS)
+    img.save(filename, 'PNG')
+    PORTRAIT_CACHE.store(query, img, CFG.PORTRAIT_SIZE)
+    return img
+
+# Annulation coopérative : chaque thread de course connaît l'événement de sa course
+_ACQUISITION = threading.local()
+
+def acquisition_cancelled():
+    """Indique si la course d'acquisition du thread courant a déjà trouvé un gagnant."""
+    event = getattr(_ACQUISITION, 'cancel', None)
+    return event is not None and event.is_set()
+
+_HTTP_SESSION = None
+_HTTP_LOCK = threading.Lock()
+
+def http_session():
+    """Session `requests` partagée : keep-alive par hôte et retries avec backoff exponentiel."""
+    global _HTTP_SESSION
+    with _HTTP_LOCK:
+        if _HTTP_SESSION is None:
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            retry = Retry(
+                total=CFG.HTTP_RETRIES,
+                backoff_factor=CFG.HTTP_BACKOFF,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(['GET']),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=CFG.HTTP_POOL_HOSTS,
+                pool_maxsize=CFG.HTTP_POOL_SIZE,
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.headers.update(CFG.HTTP_HEADERS)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _HTTP_SESSION = session
+        return _HTTP_SESSION
+
+def http_get(url, image=False, **kwargs):
+    """GET via la session partagée avec le délai par défaut de la configuration."""
+    kwargs.setdefault('timeout', CFG.HTTP_TIMEOUT)
+    if image:
+        kwargs['headers'] = {'Accept': CFG.HTTP_IMAGE_ACCEPT, **kwargs.get('headers', {})}
+    return http_session().get(url, **kwargs)
+
+class AcquisitionCancelled(Exception):
+    """Levée quand la course d'acquisition du thread courant est annulée en pleine requête."""
+
+class RequestPlanner:
+    """Mémoïse pour la durée du run chaque requête distante, indexée par (source, variante).
+
+    Les résultats négatifs (None) sont conservés aussi, et une requête déjà en vol
+    dans un autre thread est attendue plutôt que relancée. Le planificateur retient
+    aussi les noms pour lesquels toutes les sources ont échoué.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results = {}
+        self._failed_names = set()
+
+    def fetch(self, source, variant, fn):
+        """Retourne le résultat de `fn()` pour (source, variante), en ne l'exécutant qu'une fois."""
+        key = (source, normalize_query(variant))
+        while True:
+            with self._lock:
+                future = self._results.get(key)
+                owner = future is None
+                if owner:
+                    future = Future()
+                    self._results[key] = future
+            if owner:
+                break
+            try:
+                result = future.result()
+            except AcquisitionCancelled:
+                # Annulée par la course d'un autre nom : on reprend la main si la nôtre continue
+                if acquisition_cancelled():
+                    raise
+                continue
+            print(f"    ♻️  Déjà tenté ({source}: {variant}) -> {'ok' if result is not None else 'échec'}")
+            return result
+        try:
+            result = fn()
+        except AcquisitionCancelled as e:
+            # Pas de mémorisation d'un résultat interrompu
+            with self._lock:
+                self._results.pop(key, None)
+            future.set_exception(e)
+            raise
+        except Exception as e:
+            print(f"    ⚠️  Échec {source} ({variant}): {e}")
+            result = None
+        future.set_result(result)
+        return result
+
+    def mark_failed(self, name):
+        with self._lock:
+            self._failed_names.add(normalize_query(name))
+
+    def known_failure(self, name):
+        with self._lock:
+            return normalize_query(name) in self._failed_names
+
+PLANNER = RequestPlanner()
+
+def fetch_image_bytes(url, require_image_type=True):
+    """Télécharge une image en streaming et retourne son contenu, ou None si la réponse
+    n'est pas exploitable ou dépasse `CFG.MAX_IMAGE_BYTES`."""
+    with http_get(url, image=True, stream=True) as response:
+        content_type = response.headers.get('content-type', '')
+        if response.status_code != 200 or (require_image_type and not content_type.startswith('image/')):
+            print(f"    ⚠️  Réponse non-image reçue (status: {response.status_code}, content-type: {content_type})")
+            return None
+        declared = int(response.headers.get('content-length') or 0)
+        if declared > CFG.MAX_IMAGE_BYTES:
+            print(f"    ⚠️  Image trop lourde ({declared} octets), ignorée")
+            return None
+        buf = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            if acquisition_cancelled():
+                raise AcquisitionCancelled(url)
+            buf += chunk
+            if len(buf) > CFG.MAX_IMAGE_BYTES:
+                print(f"    ⚠️  Image trop lourde (> {CFG.MAX_IMAGE_BYTES} octets), transfert abandonné")
+                return None
+        return bytes(buf)
+
+def _wikimedia_lookup(variant):
+    """Recherche `variant` sur Wikimedia Commons et retourne les octets de la première image valable."""
+    url = (
+        "https://commons.wikimedia.org/w/api.php?"
+        "action=query&format=json&prop=imageinfo&generator=search&gsrsearch="
+        + requests.utils.quote(variant) +
+        "&gsrlimit=3&iiprop=url|size|mime"
+        f"&iiurlwidth={CFG.PORTRAIT_SIZE[0]}"
+    )
+    try:
+        print(f"    🔍 Recherche Wikimedia: {variant}")
+        r = http_get(url)
+        data = r.json()
+        pages = data.get('query', {}).get('pages', {})
+        
+        for page in pages.values():
+            if acquisition_cancelled():
+                raise AcquisitionCancelled(variant)
+            if 'imageinfo' in page:
+                img_info = page['imageinfo'][0]
+                # Miniature générée par le serveur à la taille cible, sinon l'original (plafonné)
+                img_url = img_info.get('thumburl') or img_info['url']
+                
+                # Vérifier que c'est une image de taille raisonnable
+                if 'size' in img_info and img_info['size'] > 10000:  # Au moins 10KB
+                    print(f"    📥 Téléchargement depuis: {img_url}")
+                    img_data = fetch_image_bytes(img_url)
+                    if img_data is not None:
+                        return img_data
+    except AcquisitionCancelled:
+        raise
+    except Exception as e:
+        print(f"    ❌ Erreur Wikimedia {variant}: {e}")
+    return None
+
+# =========================
+# Avatars procéduraux (générés par lots en NumPy)
+# =========================
+AVATAR_SKIN_COLORS = np.array([
+    (255, 224, 189), (255, 205, 148), (234, 192, 134), (255, 173, 96),
+    (234, 153, 153), (255, 198, 140), (255, 218, 185), (255, 228, 196),
+    (255, 235, 205), (255, 245, 238), (245, 245, 220), (255, 250, 240)
+], dtype=np.uint8)
+AVATAR_HAIR_COLORS = np.array([
+    (139, 69, 19), (160, 82, 45), (210, 105, 30), (244, 164, 96),
+    (255, 215, 0), (255, 255, 0), (255, 165, 0), (255, 0, 0),
+    (128, 0, 128), (0, 0, 255), (0, 255, 0), (255, 192, 203)
+], dtype=np.uint8)
+AVATAR_MOUTH_COLOR = np.array((139, 69, 19), dtype=np.uint8)
+
+_AVATAR_MASKS = None
+_AVATAR_GLYPHS = {}
+_AVATAR_CACHE = {}
+# Avatars générés, indexés par chemin : (nom normalisé, tableau RGBA) — aucun PNG écrit
+_GENERATED_PORTRAITS = {}
+
+def _avatar_masks():
+    """Masques booléens (400x400) des formes du visage, rastérisés une seule fois avec PIL."""
+    global _AVATAR_MASKS
+    if _AVATAR_MASKS is None:
+        from PIL import ImageDraw
+        head_width, head_height = 200, 250
+        head_x = (400 - head_width) // 2
+        head_y = (400 - head_height) // 2
+        eye_size = 25
+        eye_y = head_y + 100
+        nose_x = head_x + head_width // 2
+        nose_y = eye_y + 40
+        mouth_y = nose_y + 40
+
+        def mask(draw_fn):
+            im = Image.new('L', (400, 400), 0)
+            draw_fn(ImageDraw.Draw(im))
+            return np.asarray(im) > 0
+
+        _AVATAR_MASKS = {
+            'head': mask(lambda d: d.ellipse([head_x, head_y, head_x + head_width, head_y + head_height], fill=255)),
+            'eyes': mask(lambda d: (
+                d.ellipse([head_x + 60, eye_y, head_x + 60 + eye_size, eye_y + eye_size], fill=255),
+                d.ellipse([head_x + 140, eye_y, head_x + 140 + eye_size, eye_y + eye_size], fill=255),
+            )),
+            'nose': mask(lambda d: d.ellipse([nose_x - 10, nose_y, nose_x + 10, nose_y + 20], fill=255)),
+            'mouth': mask(lambda d: d.arc([nose_x - 20, mouth_y, nose_x + 20, mouth_y + 15], 0, 180, fill=255, width=3)),
+            # Cheveux courts pour les hommes, longs pour les femmes
+            'hair_male': mask(lambda d: d.polygon([
+                (head_x - 20, head_y - 20), (head_x + head_width + 20, head_y - 20),
+                (head_x + head_width + 30, head_y + 50), (head_x - 30, head_y + 50)
+            ], fill=255)),
+            'hair_female': mask(lambda d: d.polygon([
+                (head_x - 30, head_y - 40), (head_x + head_width + 30, head_y - 40),
+                (head_x + head_width + 40, head_y + 100), (head_x - 40, head_y + 100)
+            ], fill=255)),
+            'text_y': head_y + head_height + 20,
+        }
+    return _AVATAR_MASKS
+
+def _avatar_glyph(letter):
+    """Couvertures (ombre, texte) en float32 de l'initiale, rendues une fois par lettre."""
+    if letter not in _AVATAR_GLYPHS:
+        from PIL import ImageDraw, ImageFont
+        try:
+            font = ImageFont.truetype("arial.ttf", 40)
+        except:
+            font = ImageFont.load_default()
+        text_bbox = ImageDraw.Draw(Image.new('L', (1, 1))).textbbox((0, 0), letter, font=font)
+        text_x = (400 - (text_bbox[2] - text_bbox[0])) // 2
+        text_y = _avatar_masks()['text_y']
+        layers = []
+        for dx in (2, 0):
+            im = Image.new('L', (400, 400), 0)
+            ImageDraw.Draw(im).text((text_x + dx, text_y + dx), letter, fill=255, font=font)
+            layers.append(np.asarray(im, dtype=np.float32) / 255.0)
+        _AVATAR_GLYPHS[letter] = tuple(layers)
+    return _AVATAR_GLYPHS[letter]
+
+def avatar_seed(name):
+    """Graine stable dérivée du nom : un même nom donne toujours le même visage."""
+    return zlib.crc32(normalize_query(name).encode('utf-8'))
+
+def generate_avatars(specs):
+    """Génère en un seul passage vectorisé les avatars `(nom, is_male, seed)` demandés.
+
+    Retourne une liste de tableaux RGBA (400, 400, 4) uint8. Les résultats sont
+    mémorisés par (nom, genre, graine) : un avatar déjà dessiné n'est jamais redessiné.
+    """
+    keys = [
+        (normalize_query(name), bool(is_male), avatar_seed(name) if seed is None else seed)
+        for name, is_male, seed in specs
+    ]
+    names = {key: name for key, (name, _, _) in zip(keys, specs)}
+    missing = list(dict.fromkeys(key for key in keys if key not in _AVATAR_CACHE))
+    if missing:
+        masks = _avatar_masks()
+        n = len(missing)
+        skin = np.empty((n, 3), dtype=np.uint8)
+        eyes = np.empty((n, 3), dtype=np.uint8)
+        hair = np.empty((n, 3), dtype=np.uint8)
+        for i, (_, _, seed) in enumerate(missing):
+            rng = random.Random(seed)
+            skin[i] = AVATAR_SKIN_COLORS[rng.randrange(len(AVATAR_SKIN_COLORS))]
+            eyes[i] = [rng.randint(50, 150) for _ in range(3)]
+            hair[i] = AVATAR_HAIR_COLORS[rng.randrange(len(AVATAR_HAIR_COLORS))]
+        males = np.array([is_male for _, is_male, _ in missing])
+
+        rgba = np.zeros((n, 400, 400, 4), dtype=np.uint8)
+        for mask, colors in ((masks['head'], skin), (masks['eyes'], eyes), (masks['nose'], skin)):
+            rgba[:, mask, :3] = colors[:, None, :]
+            rgba[:, mask, 3] = 255
+        rgba[:, masks['mouth'], :3] = AVATAR_MOUTH_COLOR
+        rgba[:, masks['mouth'], 3] = 255
+        hair_mask = np.where(males[:, None, None], masks['hair_male'], masks['hair_female'])
+        rgba[..., :3] = np.where(hair_mask[..., None], hair[:, None, None, :], rgba[..., :3])
+        rgba[..., 3][hair_mask] = 255
+
+        # Initiale : ombre noire semi-transparente puis lettre blanche
+        glyphs = [_avatar_glyph(names[key][0].upper()) for key in missing]
+        out = rgba.astype(np.float32)
+        for layer, ink in ((0, (0.0, 0.0, 0.0, 128.0)), (1, (255.0, 255.0, 255.0, 255.0))):
+            cover = np.stack([g[layer] for g in glyphs])[..., None]
+            out = out * (1.0 - cover) + np.array(ink, dtype=np.float32) * cover
+        rgba = np.rint(out).astype(np.uint8)
+
+        for i, key in enumerate(missing):
+            _AVATAR_CACHE[key] = rgba[i]
+    return [_AVATAR_CACHE[key] for key in keys]
+
+def create_realistic_avatars(jobs):
+    """Crée d'un coup les avatars `(nom, fichier, is_male)` et les enregistre en mémoire."""
+    arrays = generate_avatars([(name, is_male, None) for name, _, is_male in jobs])
+    for (name, filename, _), arr in zip(jobs, arrays):
+        _GENERATED_PORTRAITS[os.path.abspath(filename)] = (normalize_query(name), arr)
+        print(f"🎨 Avatar réaliste créé pour {name}: {filename}")
+    return True
+
+def create_realistic_avatar(name, filename, is_male=True):
+    """Crée un avatar réaliste avec un visage généré."""
+    return create_realistic_avatars([(name, filename, is_male)])
+
+def generated_portrait(person, path):
+    """Avatar généré pour `person` à l'emplacement `path`, ou None."""
+    if person is None:
+        return None
+    entry = _GENERATED_PORTRAITS.get(os.path.abspath(path))
+    if entry is None or entry[0] != normalize_query(person):
+        return None
+    return entry[1]
+
+# =========================
+# Acquisition concurrente des portraits
+# =========================
+def wikimedia_variants(query):
+    """Variantes de recherche Wikimedia d'un nom, sans doublons."""
+    words = query.split()
+    variants = [query, query + " portrait", query + " face", query + " headshot",
+                words[0] + " " + words[-1] if len(words) > 1 else words[0], words[0]]
+    return list(dict.fromkeys(variants))
+
+def portrait_from(source, variant, lookup, query, filename):
+    """Une seule requête distante (mémoïsée par le planificateur) ; écrit le portrait si elle aboutit.
+
+    Ne crée jamais d'avatar : un échec est renvoyé tel quel à la course.
+    """
+    try:
+        img_data = PLANNER.fetch(source, variant, lookup)
+    except AcquisitionCancelled:
+        return False
+    if img_data is None or acquisition_cancelled():
+        return False
+    try:
+        save_portrait(img_data, query, filename)
+    except Exception as e:
+        print(f"    ⚠️  Format d'image non reconnu ({source}: {variant}): {e}")
+        return False
+    print(f"    ✅ Image {source} sauvegardée: {filename}")
+    return True
+
+def portrait_sources(query):
+    """Requêtes élémentaires en concurrence pour `query` : [(libellé, fn(query, fichier))].
+
+    Chaque variante Wikimedia est une source à part entière, à côté d'Unsplash
+    (featured et simple) et de picsum : un échec complet ne dure pas plus que la
+    plus lente d'entre elles.
+    """
+    quoted = requests.utils.quote
+    featured = f"https://source.unsplash.com/featured/400x400/?{quoted(query + ' person face portrait')}"
+    unsplash = f"https://source.unsplash.com/400x400/?{quoted(query + ',portrait,face')}"
+    picsum = f"https://picsum.photos/400/400?random={hash(query) % 1000}"
+    lookups = [(f"Wikimedia-{k}", "wikimedia", v, lambda v=v: _wikimedia_lookup(v))
+               for k, v in enumerate(wikimedia_variants(query))]
+    lookups += [
+        ("Unsplash-featured", "unsplash-featured", query, lambda: fetch_image_bytes(featured)),
+        ("Unsplash", "unsplash", query, lambda: fetch_image_bytes(unsplash)),
+        ("Picsum", "picsum", query, lambda: fetch_image_bytes(picsum, require_image_type=False)),
+    ]
+    return [(label, lambda q, f, source=source, variant=variant, lookup=lookup:
+             portrait_from(source, variant, lookup, q, f))
+            for label, source, variant, lookup in lookups]
+
+def race_portrait_sources(query, filename, sources=None, timeout=None):
+    """Interroge toutes les sources en parallèle et garde la première image valide.
+
+    Chaque source écrit dans son propre fichier temporaire ; la première qui réussit
+    le renomme en `filename` et déclenche l'annulation des autres, qui abandonnent
+    au prochain point de contrôle (entre deux requêtes). Si toutes échouent, rien
+    n'est écrit : l'appelant crée alors un avatar.
+    """
+    _preload(requests)
+    sources = portrait_sources(query) if sources is None else sources
+    if PORTRAIT_CACHE.fetch(query, filename, CFG.PORTRAIT_SIZE):
+        return True
+    cancel = threading.Event()
+    lock = threading.Lock()
+    base, ext = os.path.splitext(filename)
+
+    def run(label, fn, tmp):
+        _ACQUISITION.cancel = cancel
+        try:
+            ok = fn(query, tmp)
+        except Exception as e:
+            print(f"    ❌ Erreur {label} pour {query}: {e}")
+            ok = False
+        finally:
+            _ACQUISITION.cancel = None
+        with lock:
+            if ok and not cancel.is_set():
+                os.replace(tmp, filename)
+                cancel.set()
+                print(f"    🏁 {label} remporte la course pour {query}")
+                return True
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+
+    pool = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="portrait")
+    futures = [
+        pool.submit(run, label, fn, f"{base}.{label.lower()}{ext}")
+        for label, fn in sources
+    ]
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            if future.result():
+                return True
+        PLANNER.mark_failed(query)
+    except FutureTimeout:
+        print(f"    ⏱️  Délai dépassé pour {query}")
+    finally:
+        cancel.set()
+        pool.shutdown(wait=False, cancel_futures=True)
     return False
 
-def download_image_robust(query, filename):
-    """Télécharge une image avec plusieurs sources et méthodes robustes."""
+def acquire_portrait(query, filename, timeout=None):
+    """Acquiert un portrait : pack hors-ligne, puis cache disque, puis course entre sources.
+
+    Un nom présent dans le pack n'écrit aucun fichier : les chargeurs le lisent
+    directement dans le pack via `portrait_array`.
+    """
+    if PORTRAIT_PACK.has(query):
+        print(f"    📦 Portrait pris dans le pack pour {query}")
+        return True
+    if CFG.OFFLINE:
+        ok = PORTRAIT_CACHE.fetch(query, filename, CFG.PORTRAIT_SIZE)
+    else:
+        ok = race_portrait_sources(query, filename, timeout=timeout)
+    if ok:
+        # Le fichier contient désormais un vrai portrait : oublier un éventuel avatar généré
+        _GENERATED_PORTRAITS.pop(os.path.abspath(filename), None)
+    return ok
+
+def acquire_portraits(jobs, timeout=None, max_workers=None):
+    """Acquiert plusieurs portraits `(query, filename)` en parallèle ; retourne les succès."""
+    timeout = CFG.ACQUIRE_TIMEOUT if timeout is None else timeout
+    max_workers = max_workers or max(1, len(jobs))
+    _preload(requests)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="acquire") as pool:
+        return list(pool.map(lambda job: acquire_portrait(*job, timeout=timeout), jobs))
+
+# --- LISTES SÉPARÉES HOMMES/FEMMES ---
+HOMMES = [
+    "Lionel Messi", "Cristiano Ronaldo", "Kylian Mbappe", "Neymar Jr", "Erling Haaland", "Karim Benzema", "Luka Modric", "Vinicius Junior", "Robert Lewandowski", "Mohamed Salah", "Antoine Griezmann", "Paulo Dybala", "Sergio Ramos", "Kevin De Bruyne", "Harry Kane", "LeBron James", "Stephen Curry", "Giannis Antetokounmpo", "Novak Djokovic", "Rafael Nadal", "Roger Federer", "Conor McGregor", "Khabib Nurmagomedov", "Mike Tyson", "Floyd Mayweather", "Usain Bolt", "Lewis Hamilton", "Michael Jordan", "IShowSpeed", "Ninja gamer", "xQc", "PewDiePie", "Squeezie", "MrBeast", "Dream Minecraft", "Markiplier", "Ludwig Ahgren", "SypherPK", "TimTheTatman", "TommyInnit", "Drake", "Travis Scott", "The Weeknd", "Eminem", "Kanye West", "Justin Bieber", "Ed Sheeran", "Post Malone", "Logan Paul", "Jake Paul", "Elon Musk", "Jeff Bezos", "Mark Zuckerberg", "Donald Trump", "Vladimir Putin", "Jordan Peterson", "Joe Rogan", "Ben Shapiro", "Spider Man", "Iron Man", "Captain America", "Batman", "Superman", "Deadpool", "Thanos", "Black Panther", "Naruto Uzumaki", "Sasuke Uchiha", "Son Goku", "Vegeta", "Monkey D Luffy", "Roronoa Zoro", "Eren Yeager", "Levi Ackerman", "Saitama One Punch Man", "Gojo Satoru", "Tanjiro Kamado", "Light Yagami", "L Death Note", "Shinji Ikari", "Noah Beck", "Brent Rivera", "Mr Fresh Asian", "Brent Faiyaz", "Harry Styles", "BTS Jungkook", "BTS Jimin", "BTS V Taehyung", "Maluma", "Cristiano Ronaldo Jr", "Lionel Messi Jr", "Barack Obama", "Prince Harry", "Zayn Malik", "Mario Nintendo", "Luigi Nintendo", "Sonic the Hedgehog", "Knuckles Sonic", "Tails Sonic", "Lara Croft", "Master Chief Halo", "Kratos God of War", "Atreus God of War", "Link Legend of Zelda", "Ganondorf Zelda", "Will Smith", "Chris Rock", "Keanu Reeves", "Jason Momoa", "David Schwimmer", "Zlatan Ibrahimovic", "Andrea Pirlo", "Francesco Totti", "Ronaldinho", "David Beckham", "Eden Hazard", "Mesut Ozil", "Alexis Sanchez", "Canelo Alvarez", "Tyson Fury"
+]
+FEMMES = [
+    "Serena Williams", "Naomi Osaka", "Pokimane", "Amouranth", "Valkyrae", "Taylor Swift", "Beyonce", "Rihanna", "Billie Eilish", "Doja Cat", "Dua Lipa", "Olivia Rodrigo", "Zendaya", "Scarlett Johansson", "Margot Robbie", "Jennifer Lawrence", "Anne Hathaway", "Greta Thunberg", "Amber Heard", "Wonder Woman", "Nezuko Kamado", "Charli DAmelio", "Addison Rae", "Bella Poarch", "Khaby Lame", "Loren Gray", "Avani Gregg", "Dixie DAmelio", "Nikkie Tutorials", "James Charles", "Shakira", "Adele", "Ariana Grande", "Cardi B", "Nicki Minaj", "Lisa Blackpink", "Jennie Blackpink", "Rose Blackpink", "Jisoo Blackpink", "Anitta", "Oprah Winfrey", "Michelle Obama", "Meghan Markle", "Kim Kardashian", "Kylie Jenner", "Kendall Jenner", "Gigi Hadid", "Bella Hadid", "Paris Hilton", "Selena Gomez", "Princess Peach", "Zelda Princess", "Samus Aran", "Jada Pinkett Smith", "Gal Gadot", "Millie Bobby Brown", "Sadie Sink", "Courteney Cox", "Lisa Kudrow", "Matt LeBlanc", "Naomi Scott", "Emma Watson", "Emma Stone", "Florence Pugh", "Natalie Portman", "Jessica Alba", "Eva Mendes", "Mila Kunis", "Kate Winslet", "Angelina Jolie", "Reese Witherspoon", "Julia Roberts", "Sandra Bullock", "Anne Curtis", "Priyanka Chopra", "Deepika Padukone", "Alia Bhatt", "Kriti Sanon", "Anushka Sharma", "Halle Berry", "Monica Bellucci", "Salma Hayek", "Penelope Cruz", "Cameron Diaz", "Kristen Stewart", "Kirsten Dunst", "Dakota Johnson", "Lily Collins", "Sofia Vergara", "Megan Fox", "Halsey", "Katy Perry", "Ellie Goulding", "Charli XCX", "Camila Cabello", "Lauren Jauregui", "Normani", "Becky G", "Tini Stoessel", "Madison Beer", "Hailee Steinfeld", "Lana Del Rey", "Kacey Musgraves", "Sabrina Carpenter"
+]
+
+# --- LISTE COMBINÉE POUR LA SÉLECTION ALÉATOIRE ---
+PERSONNALITIES = HOMMES + FEMMES
+
+# =========================
+# Pack hors-ligne des portraits
+# =========================
+class PortraitPack:
+    """Archive de portraits RGBA de taille fixe, lue sans copie via `np.memmap`.
+
+    Les enregistrements (N, 400, 400, 4) uint8 sont dans un seul fichier `.npy` ;
+    un index JSON à côté associe chaque nom normalisé à son numéro d'enregistrement.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        self.index_path = self.path.with_suffix('.json')
+        self._index = None
+        self._data = None
+
+    def _load(self):
+        if self._index is not None:
+            return
+        self._index = {}
+        if not (self.path.exists() and self.index_path.exists()):
+            return
+        try:
+            with open(self.index_path, encoding='utf-8') as fh:
+                index = json.load(fh)
+            self._data = np.load(self.path, mmap_mode='r')
+            self._index = {name: int(slot) for name, slot in index['names'].items()}
+            print(f"📦 Pack de portraits chargé: {len(self._index)} entrées ({self.path})")
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️  Pack de portraits illisible ({self.path}): {e}")
+            self._data = None
+            self._index = {}
+
+    def has(self, name):
+        self._load()
+        return normalize_query(name) in self._index
+
+    def get(self, name):
+        """Retourne une vue (400, 400, 4) en lecture seule sur le portrait, ou None."""
+        self._load()
+        slot = self._index.get(normalize_query(name))
+        return None if slot is None else self._data[slot]
+
+    def names(self, pool):
+        """Filtre `pool` pour ne garder que les noms présents dans le pack."""
+        return [name for name in pool if self.has(name)]
+
+    def write(self, entries):
+        """Écrit le pack à partir d'une liste `(nom, chemin PNG ou tableau RGBA)` (remplacement atomique)."""
+        w, h = CFG.PORTRAIT_SIZE
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.stem + '.tmp.npy')
+        data = np.lib.format.open_memmap(tmp, mode='w+', dtype=np.uint8, shape=(len(entries), h, w, 4))
+        names = {}
+        for slot, (name, source) in enumerate(entries):
+            if isinstance(source, np.ndarray):
+                data[slot] = source
+            else:
+                with Image.open(source) as im:
+                    data[slot] = np.asarray(im.convert('RGBA').resize((w, h), Image.Resampling.LANCZOS))
+            names[normalize_query(name)] = slot
+        data.flush()
+        del data
+        # Ne plus tenir l'ancien fichier mappé au moment de le remplacer
+        self._index = None
+        self._data = None
+        tmp_index = self.index_path.with_name(self.index_path.stem + '.tmp.json')
+        with open(tmp_index, 'w', encoding='utf-8') as fh:
+            json.dump({'size': [w, h], 'names': names}, fh, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        os.replace(tmp_index, self.index_path)
+        self._index = None
+        self._data = None
+
+PORTRAIT_PACK = PortraitPack(CFG.PACK_PATH)
+
+def pick_name(pool, rng=random):
+    """Tire un nom au hasard ; hors-ligne, uniquement parmi ceux présents dans le pack."""
+    candidates = PORTRAIT_PACK.names(pool) if CFG.OFFLINE else pool
+    return rng.choice(candidates or pool)
+
+def in_memory_portrait(person, path):
+    """Portrait déjà en mémoire (pack mappé ou avatar généré) pour `person`, ou None."""
+    if person is None:
+        return None
+    packed = PORTRAIT_PACK.get(person)
+    if packed is not None:
+        return packed
+    return generated_portrait(person, path)
+
+def portrait_array(person, path):
+    """Portrait RGBA (400, 400, 4) uint8 : pack ou avatar en mémoire si possible, sinon PNG décodé."""
+    cached = in_memory_portrait(person, path)
+    if cached is not None:
+        return cached
+    img = Image.open(path).convert('RGBA')
+    if img.size != CFG.PORTRAIT_SIZE:
+        img = img.resize(CFG.PORTRAIT_SIZE, Image.Resampling.LANCZOS)
+    return np.array(img)
+
+def build_portrait_pack(names=None, path=None, workers=8):
+    """Pré-télécharge tous les portraits et les range dans un pack mappable en mémoire.
+
+    Seuls les vrais portraits (ceux qui finissent dans le cache disque) sont retenus ;
+    les avatars générés en secours ne sont pas archivés. Un nom déjà présent dans un
+    pack (celui qu'on réécrit ou celui chargé) garde son enregistrement s'il n'est pas
+    dans le cache : relancer le pré-téléchargement ne perd rien.
+    """
+    names = PERSONNALITIES if names is None else names
+    pack = PortraitPack(path or CFG.PACK_PATH)
+    work_dir = Path("prefetch_tmp")
+    work_dir.mkdir(exist_ok=True)
+    jobs = [(name, str(work_dir / f"portrait_{i}.png")) for i, name in enumerate(names)]
+    print(f"📦 Pré-téléchargement de {len(jobs)} portraits...")
+    acquire_portraits(jobs, max_workers=workers)
+    entries = []
+    for name in names:
+        cached = PORTRAIT_CACHE.lookup(name, CFG.PORTRAIT_SIZE)
+        packed = pack.get(name)
+        if packed is None:
+            packed = PORTRAIT_PACK.get(name)
+        if cached is not None:
+            entries.append((name, cached))
+        elif packed is not None:
+            entries.append((name, np.array(packed)))
+        else:
+            print(f"  ⚠️  Aucun portrait pour {name}, ignoré")
+    pack.write(entries)
+    shutil.rmtree(work_dir, ignore_errors=True)
+    print(f"✅ Pack écrit: {pack.path} ({len(entries)}/{len(names)} portraits)")
+    return pack
+
+# --- DEMANDE DES NOMS ET TÉLÉCHARGEMENT AUTOMATIQUE ---
+def get_or_download_images(pair=None):
+    img1, img2 = 'img1.png', 'img2.png'
+    tried = set()
+    for attempt in range(15):
+        # Couple imposé au premier essai, sinon un homme et une femme tirés au hasard
+        if pair and attempt == 0:
+            n1, n2 = pair
+        else:
+            n1 = pick_name(HOMMES)
+            n2 = pick_name(FEMMES)
+        if (n1, n2) in tried or (n2, n1) in tried:
+            continue
+        tried.add((n1, n2))
+        # Inutile de retenter un nom dont toutes les sources ont déjà échoué pendant ce run
+        if PLANNER.known_failure(n1) or PLANNER.known_failure(n2):
+            print(f"⏭️  {n1} ou {n2} déjà en échec, on passe")
+            continue
+        
+        print(f"🔍 Tentative {attempt + 1}/15: Recherche d'images pour {n1} et {n2}")
+        
+        # Toutes les sources en parallèle, pour l'homme et la femme en même temps
+        print(f"  📥 Téléchargement concurrent pour {n1} et {n2}...")
+        ok1, ok2 = acquire_portraits([(n1, img1), (n2, img2)])
+        
+        # Si toujours rien, créer des avatars réalistes (en un seul lot)
+        missing = [(n, path, is_male) for n, path, is_male, ok in
+                   ((n1, img1, True, ok1), (n2, img2, False, ok2)) if not ok]
+        if missing:
+            print(f"  🎨 Création d'avatars réalistes pour {', '.join(n for n, _, _ in missing)}...")
+            ok1 = ok2 = create_realistic_avatars(missing)
+        
+        if ok1 and ok2:
+            print(f"✅ Images trouvées/créées pour {n1} et {n2}")
+            return img1, img2, n1.upper(), n2.upper()
+        else:
+            print(f"⚠️  Impossible de trouver/créer des images pour {n1} ou {n2}, nouvelle tentative...")
+    
+    # Dernière tentative avec des avatars réalistes
+    print("🔄 Dernière tentative avec des avatars réalistes...")
+    n1 = pick_name(HOMMES)
+    n2 = pick_name(FEMMES)
+    create_realistic_avatars([(n1, img1, True), (n2, img2, False)])
+    return img1, img2, n1.upper(), n2.upper()
+
+# =========================
+# Initialisation paresseuse de pygame, des polices et des avatars du duel
+# =========================
+_PYGAME_READY = False
+_FONTS = {}
+_FONT_PATHS = None
+_DUEL_ASSETS = None
+
+def init_pygame():
+    """Initialise pygame au premier besoin (aucun effet de bord à l'import du module)."""
+    global _PYGAME_READY
+    if not _PYGAME_READY:
+        pygame.init()
+        # Créer une surface virtuelle pour éviter l'erreur "No video mode has been set"
+        pygame.display.set_mode((1, 1), pygame.NOFRAME)
+        _PYGAME_READY = True
+
+def resolve_font_path(name):
+    """Chemin du fichier de police `name`, mémorisé sur disque dans `CFG.FONT_CACHE`.
+
+    Seul un nom absent du cache déclenche le scan des polices système (`fc-list`) ;
+    les processus suivants, workers compris, relisent le fichier.
+    """
+    global _FONT_PATHS
+    if _FONT_PATHS is None:
+        try:
+            with open(CFG.FONT_CACHE, encoding='utf-8') as fh:
+                _FONT_PATHS = json.load(fh)
+        except (OSError, ValueError):
+            _FONT_PATHS = {}
+    if name not in _FONT_PATHS:
+        _FONT_PATHS[name] = pygame.font.match_font(name)
+        try:
+            with open(CFG.FONT_CACHE, 'w', encoding='utf-8') as fh:
+                json.dump(_FONT_PATHS, fh)
+        except OSError:
+            pass
+    return _FONT_PATHS[name]
+
+def get_font(size, name=None):
+    """Équivalent de `pygame.font.SysFont(name, size)`, sans scan des polices système.
+
+    `None` est la police intégrée de pygame, chargée directement ; un nom passe par
+    `resolve_font_path` (police par défaut si introuvable, comme `SysFont`).
+    """
+    key = (name, size)
+    if key not in _FONTS:
+        init_pygame()
+        path = None if name is None else resolve_font_path(name)
+        _FONTS[key] = pygame.font.Font(path, size)
+    return _FONTS[key]
+
+class SpriteCache:
+    """Cache LRU borné de surfaces pré-rendues, indexé par une clé hashable."""
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+
+    def get(self, key, build):
+        """Retourne la surface pour `key`, construite par `build()` au premier accès."""
+        item = self._items.get(key)
+        if item is None:
+            item = build()
+            self._items[key] = item
+            if len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        else:
+            self._items.move_to_end(key)
+        return item
+
+    def clear(self):
+        self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+TEXT_SPRITES = SpriteCache(CFG.TEXT_CACHE_SIZE)
+HALO_SPRITES = SpriteCache(64)
+SCALED_SPRITES = SpriteCache(512)
+
+def render_text(font, text, color, size=None):
+    """Texte anti-aliasé, éventuellement mis à l'échelle `size`, rastérisé une fois par valeur."""
+    def build():
+        surf = font.render(text, True, color)
+        if size is not None:
+            surf = pygame.transform.smoothscale(surf, size)
+        return surf
+    return TEXT_SPRITES.get((font, text, tuple(color), size), build)
+
+def duel_assets(pair=None):
+    """Avatars et noms du duel, téléchargés et chargés au premier appel seulement."""
+    global _DUEL_ASSETS
+    if _DUEL_ASSETS is None:
+        init_pygame()
+        path1, path2, name1, name2 = get_or_download_images(pair)
+        _DUEL_ASSETS = (
+            load_or_fallback(path1, CFG.COLORS['p1'], name1),
+            load_or_fallback(path2, CFG.COLORS['p2'], name2),
+            name1,
+            name2,
+        )
+    return _DUEL_ASSETS
+
+def export_duel_assets():
+    """Avatars du duel en octets RGBA, transmissibles à d'autres processus."""
+    img1, img2, name1, name2 = duel_assets()
+    return (img1.get_size(), pygame.image.tobytes(img1, 'RGBA'), pygame.image.tobytes(img2, 'RGBA'), name1, name2)
+
+def install_duel_assets(payload):
+    """Installe des avatars exportés par `export_duel_assets` (sans téléchargement)."""
+    global _DUEL_ASSETS
+    init_pygame()
+    size, data1, data2, name1, name2 = payload
+    _DUEL_ASSETS = (
+        pygame.image.frombytes(data1, size, 'RGBA').convert_alpha(),
+        pygame.image.frombytes(data2, size, 'RGBA').convert_alpha(),
+        name1,
+        name2,
+    )
+
+def load_or_fallback(name, color, person=None):
+    """Charge une image avec gestion robuste des erreurs et conversion automatique."""
     try:
-        print(f"    🔍 Recherche robuste pour: {query}")
+        packed = in_memory_portrait(person, name)
+        if packed is not None:
+            # Lecture directe en mémoire (pack mappé ou avatar généré), sans décoder de PNG
+            img = pygame.image.frombuffer(packed, CFG.PORTRAIT_SIZE, 'RGBA').convert_alpha()
+        else:
+            # Essayer de charger l'image avec pygame
+            img = pygame.image.load(name).convert_alpha()
+        print(f"✅ Image chargée avec succès: {name}")
+        return pygame.transform.smoothscale(img, (80, 80))
+    except Exception as e:
+        print(f"⚠️  Erreur lors du chargement de {name}: {e}")
+        # Créer un avatar de fallback
+        img = pygame.Surface((80, 80), pygame.SRCALPHA)
+        img.fill(color)
+        # Ajouter la première lettre du nom
+        try:
+            text = render_text(get_font(40), name.split('/')[-1].split('.')[0][0].upper(), (255, 255, 255))
+            text_rect = text.get_rect(center=(40, 40))
+            img.blit(text, text_rect)
+        except:
+            pass
+        return img
+
+# =========================
+# Système de particules
+# =========================
+_DISC_OFFSETS = {}
+
+def _disc_offsets(radius):
+    """Décalages (dx, dy) des pixels couverts par `pygame.draw.circle` de rayon `radius`."""
+    if radius not in _DISC_OFFSETS:
+        size = 2 * radius + 3
+        stamp = pygame.Surface((size, size), depth=32)
+        pygame.draw.circle(stamp, (255, 255, 255), (radius + 1, radius + 1), radius)
+        dx, dy = np.nonzero(pygame.surfarray.array2d(stamp))
+        _DISC_OFFSETS[radius] = (dx - radius - 1, dy - radius - 1)
+    return _DISC_OFFSETS[radius]
+
+def _packed_colors(surface, colors):
+    """Convertit des couleurs RGB (n, 3) en entiers au format pixel de `surface`."""
+    colors = np.asarray(colors, dtype=np.uint32)
+    shifts, losses = surface.get_shifts(), surface.get_losses()
+    packed = np.full(len(colors), surface.get_masks()[3], dtype=np.uint32)
+    for channel in range(3):
+        packed |= (colors[:, channel] >> losses[channel]) << shifts[channel]
+    return packed
+
+def stamp_discs(surface, xs, ys, radii, colors):
+    """Rastérise d'un coup des disques pleins dans les pixels de `surface`.
+
+    Les pixels de tous les disques sont calculés par rayon puis écrits par
+    indexation vectorisée dans la vue `pixels2d` de la surface. Là où des disques
+    se chevauchent, le dernier de la liste l'emporte, comme avec des appels
+    successifs à `pygame.draw.circle`.
+    """
+    if len(xs) == 0:
+        return
+    if surface.get_bytesize() != 4:
+        # Pas de vue entière 32 bits : tracé disque par disque
+        for x, y, r, c in zip(xs, ys, radii, colors):
+            pygame.draw.circle(surface, tuple(int(v) for v in c), (int(x), int(y)), int(r))
+        return
+    packed = _packed_colors(surface, colors)
+    pixels = pygame.surfarray.pixels2d(surface)
+    w, h = pixels.shape
+    cells, owners = [], []
+    for radius in np.unique(radii):
+        sel = np.flatnonzero(radii == radius)
+        dx, dy = _disc_offsets(int(radius))
+        px = (xs[sel, None] + dx).ravel()
+        py = (ys[sel, None] + dy).ravel()
+        ok = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+        cells.append(px[ok] * h + py[ok])
+        owners.append(np.repeat(sel, len(dx))[ok])
+    cells, owners = np.concatenate(cells), np.concatenate(owners)
+    # Pour chaque pixel, garder le disque de plus grand indice (le dernier tracé)
+    order = np.lexsort((owners, cells))
+    cells, owners = cells[order], owners[order]
+    last = np.append(cells[1:] != cells[:-1], True)
+    cells, owners = cells[last], owners[last]
+    pixels[cells // h, cells % h] = packed[owners]
+    del pixels
+
+class ParticleSystem:
+    """Particules stockées en tableaux NumPy préalloués (structure de tableaux).
+
+    L'intégration et la gravité sont vectorisées, les particules mortes sont
+    retirées sans changer l'ordre d'émission (ordre d'empilement à l'affichage)
+    et l'affichage passe par `stamp_discs`.
+    """
+    GRAVITY = 0.12
+    MAX_LIFE = 32
+
+    def __init__(self, rng, capacity=256):
+        self.rng = rng
+        self.count = 0
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.life = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+
+    def __len__(self):
+        return self.count
+
+    def _reserve(self, extra):
+        needed = self.count + extra
+        capacity = len(self.life)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ('pos', 'vel', 'life', 'color'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def random_color(self):
+        return tuple(int(c) for c in self.rng.integers(100, 256, 3))
+
+    def emit(self, x, y, n, color=None):
+        """Ajoute `n` particules en (x, y) ; `color=None` tire une couleur vive par particule."""
+        if n <= 0:
+            return
+        self._reserve(n)
+        sl = slice(self.count, self.count + n)
+        self.pos[sl] = (x, y)
+        self.vel[sl] = self.rng.uniform(-4, 4, (n, 2))
+        self.life[sl] = self.MAX_LIFE
+        self.color[sl] = self.rng.integers(100, 256, (n, 3)) if color is None else color
+        self.count += n
+
+    def snapshot(self):
+        n = self.count
+        return {'pos': self.pos[:n].copy(), 'vel': self.vel[:n].copy(), 'life': self.life[:n].copy(),
+                'color': self.color[:n].copy(), 'rng': self.rng.bit_generator.state}
+
+    def restore(self, snap):
+        self.count = 0
+        n = len(snap['life'])
+        self._reserve(n)
+        self.pos[:n], self.vel[:n], self.life[:n], self.color[:n] = snap['pos'], snap['vel'], snap['life'], snap['color']
+        self.count = n
+        self.rng.bit_generator.state = snap['rng']
+
+    def compact(self):
+        """Retire les particules mortes en tassant les vivantes, dans leur ordre d'émission."""
+        n = self.count
+        alive = self.life[:n] > 0
+        kept = int(alive.sum())
+        if kept == n:
+            return
+        for arr in (self.pos, self.vel, self.life, self.color):
+            arr[:kept] = arr[:n][alive]
+        self.count = kept
+
+    def update(self):
+        self.compact()
+        n = self.count
+        self.pos[:n] += self.vel[:n]
+        self.life[:n] -= 1
+        self.vel[:n, 1] += self.GRAVITY
+
+    def draw(self, surface):
+        n = self.count
+        live = self.life[:n] > 0
+        if not live.any():
+            return
+        pos = self.pos[:n][live].astype(np.int64)
+        radii = np.maximum(1, (6 * self.life[:n][live]) // self.MAX_LIFE)
+        stamp_discs(surface, pos[:, 0], pos[:, 1], radii, self.color[:n][live])
+
+class TrailBuffer:
+    """Traînée à taille fixe en tampon circulaire (remplace `list.pop(0)`)."""
+    def __init__(self, maxlen):
+        self.points = np.zeros((maxlen, 2))
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, x, y):
+        self.points[self.head] = (x, y)
+        self.head = (self.head + 1) % len(self.points)
+        self.count = min(self.count + 1, len(self.points))
+
+    def ordered(self):
+        """Points du plus ancien au plus récent."""
+        idx = (self.head - self.count + np.arange(self.count)) % len(self.points)
+        return self.points[idx]
 
-        # 1. Essayer Wikimedia Commons (le plus fiable)
-        if download_wikimedia_image(query, filename):
+    def snapshot(self):
+        return {'points': self.points.copy(), 'head': self.head, 'count': self.count}
+
+    def restore(self, snap):
+        self.points = snap['points'].copy()
+        self.head, self.count = snap['head'], snap['count']
+
+# =========================
+# Entités du jeu
+# =========================
+def halo_sprite(color, radius):
+    """Halo à six anneaux pré-aplati en une seule surface, construit une fois par (couleur, rayon).
+
+    Les anneaux s'additionnent avec saturation : les sommer d'abord puis faire un
+    seul blit additif donne le même résultat que six blits successifs.
+    """
+    def build():
+        halo = pygame.Surface((radius*2.5, radius*2.5), pygame.SRCALPHA)
+        ring = pygame.Surface(halo.get_size(), pygame.SRCALPHA)
+        for i in range(6, 0, -1):
+            alpha = max(10, 40 - i * 6)
+            ring.fill((0, 0, 0, 0))
+            pygame.draw.circle(ring, (*color, alpha), (radius, radius), int(radius*1.1 + i*2))
+            halo.blit(ring, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+        return halo
+    return HALO_SPRITES.get((tuple(color), radius), build)
+
+def scaled_sprite(img, size):
+    """`img` mis à l'échelle `size` (entiers), calculé une fois par taille distincte."""
+    return SCALED_SPRITES.get(('scaled', img, size), lambda: pygame.transform.smoothscale(img, size))
+
+def ring_sprite(color, radius, width):
+    """Cercle `width` px de rayon `radius` sur fond transparent, centré en (radius+1, radius+1)."""
+    def build():
+        ring = pygame.Surface((2 * radius + 2, 2 * radius + 2), pygame.SRCALPHA)
+        pygame.draw.circle(ring, color, (radius + 1, radius + 1), radius, width)
+        return ring
+    return SCALED_SPRITES.get(('ring', tuple(color), radius, width), build)
+
+class Player:
+    def __init__(self, x, y, img, color, name, cfg, seed=0, lane=0):
+        self.cfg = cfg
+        self.seed = seed
+        self.lane = lane
+        self.pos = pygame.Vector2(x, y)
+        self.vel = pygame.Vector2(0, 0)
+        self.img = img
+        self.color = color
+        self.name = name
+        self.radius = 40
+        self.score = 0
+        self.particles = ParticleSystem(np.random.default_rng([seed, lane]))
+        self.special_ready = True
+        self.special_cooldown = 0
+        self.anim = 0
+        self.power_boost = 1.0
+    def auto_control(self, tick_mod):
+        if tick_mod % 10 == 0:
+            self.vel.x += sim_uniform(self.seed, tick_mod, _RNG_JITTER_X + self.lane, -6, 6)
+            self.vel.y += sim_uniform(self.seed, tick_mod, _RNG_JITTER_Y + self.lane, -6, 6)
+            self.vel.x = max(-12, min(12, self.vel.x))
+            self.vel.y = max(-12, min(12, self.vel.y))
+        if tick_mod % 40 == 0 and sim_uniform(self.seed, tick_mod, _RNG_SPECIAL + self.lane) < 0.18:
+            return self.special_attack()
+        return False
+    def special_attack(self):
+        if self.special_ready and self.special_cooldown <= 0:
+            self.special_ready = False
+            self.special_cooldown = 40
+            self.power_boost = 3.0
+            count = (32 if self.cfg.COLORFUL_PARTICLES else 20) * self.cfg.PARTICLE_SCALE
+            self.particles.emit(self.pos.x, self.pos.y, count, None if self.cfg.COLORFUL_PARTICLES else self.color)
             return True
+        return False
+    def update(self):
+        self.vel *= 0.87
+        self.pos += self.vel * self.power_boost * (1.7 if self.cfg.ULTRA_FAST else 1)
+        self.pos.x = max(self.radius, min(self.cfg.WIDTH - self.radius, self.pos.x))
+        self.pos.y = max(self.radius, min(self.cfg.HEIGHT - self.radius, self.pos.y))
+        if abs(self.vel.x) > 2 or abs(self.vel.y) > 2:
+            color = self.particles.random_color() if self.cfg.COLORFUL_PARTICLES else self.color
+            self.particles.emit(self.pos.x, self.pos.y, (2 if self.cfg.ULTRA_FAST else 1) * self.cfg.PARTICLE_SCALE, color)
+        self.particles.update()
+        if self.special_cooldown > 0:
+            self.special_cooldown -= 1
+        elif not self.special_ready:
+            self.special_ready = True
+            self.power_boost = 1.0
+        self.anim += 1
+    def snapshot(self):
+        return {'pos': tuple(self.pos), 'vel': tuple(self.vel), 'score': self.score,
+                'special_ready': self.special_ready, 'special_cooldown': self.special_cooldown,
+                'anim': self.anim, 'power_boost': self.power_boost, 'particles': self.particles.snapshot()}
+    def restore(self, snap):
+        self.pos.update(snap['pos'])
+        self.vel.update(snap['vel'])
+        self.score = snap['score']
+        self.special_ready = snap['special_ready']
+        self.special_cooldown = snap['special_cooldown']
+        self.anim = snap['anim']
+        self.power_boost = snap['power_boost']
+        self.particles.restore(snap['particles'])
+    def draw(self, surface, score_flash=False):
+        self.particles.draw(surface)
+        # Halo lumineux
+        if self.cfg.HALO:
+            surface.blit(halo_sprite(self.color, self.radius),
+                         (self.pos.x - self.radius, self.pos.y - self.radius), special_flags=pygame.BLEND_RGBA_ADD)
+        # Zoom/impulsion
+        pulse = 1 + 0.22 * math.sin(self.anim * 0.5) if self.cfg.ZOOM else 1 + 0.08 * math.sin(self.anim * 0.25)
+        # Tailles entières en nombre limité : table de sprites au lieu d'un smoothscale par frame
+        scaled = scaled_sprite(self.img, (int(80 * pulse), int(80 * pulse)))
+        if self.special_cooldown > 30:
+            ring_radius = self.radius + 10
+            surface.blit(ring_sprite(self.color, ring_radius, 3),
+                         (int(self.pos.x) - ring_radius - 1, int(self.pos.y) - ring_radius - 1))
+        surface.blit(
+            scaled,
+            (self.pos.x - scaled.get_width() // 2, self.pos.y - scaled.get_height() // 2)
+        )
+
+class Ball:
+    def __init__(self, x, y, cfg, seed=0):
+        self.cfg = cfg
+        self.pos = pygame.Vector2(x, y)
+        self.vel = pygame.Vector2(sim_uniform(seed, 0, _RNG_BALL_X, -8, 8), sim_uniform(seed, 0, _RNG_BALL_Y, -8, 8))
+        self.radius = 14
+        self.color = cfg.COLORS['accent']
+        self.trail = TrailBuffer(22 if cfg.ULTRA_FAST else 10)
+    def update(self):
+        self.pos += self.vel * (1.6 if self.cfg.ULTRA_FAST else 1)
+        if self.pos.x < self.radius or self.pos.x > self.cfg.WIDTH - self.radius:
+            self.vel.x *= -1.18 if self.cfg.ULTRA_FAST else -1
+        if self.pos.y < self.radius or self.pos.y > self.cfg.HEIGHT - self.radius:
+            self.vel.y *= -1.18 if self.cfg.ULTRA_FAST else -1
+        self.trail.append(self.pos.x, self.pos.y)
+    def snapshot(self):
+        return {'pos': tuple(self.pos), 'vel': tuple(self.vel), 'trail': self.trail.snapshot()}
+    def restore(self, snap):
+        self.pos.update(snap['pos'])
+        self.vel.update(snap['vel'])
+        self.trail.restore(snap['trail'])
+    def draw(self, surface):
+        n = len(self.trail)
+        if n:
+            points = self.trail.ordered().astype(np.int64)
+            boost = 1.7 if self.cfg.PARTICLE_BOOST else 1
+            sizes = np.maximum(2, (self.radius * (np.arange(n) / n) * boost).astype(np.int64))
+            colors = np.broadcast_to(np.array(self.color, dtype=np.uint8), (n, 3))
+            stamp_discs(surface, points[:, 0], points[:, 1], sizes, colors)
+        pygame.draw.circle(surface, self.color, (int(self.pos.x), int(self.pos.y)), self.radius)
+
+# =========================
+# Jeu principal
+# =========================
+class Game:
+    def __init__(self, cfg, seed=None):
+        self.cfg = cfg
+        # La graine fixe toute la physique (cf. `simulate_duels`) ; `rng` sert aux effets purement visuels
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        img1, img2, name1, name2 = duel_assets()
+        self.p1 = Player(cfg.WIDTH // 4, cfg.HEIGHT // 2, img1, cfg.COLORS['p1'], name1, cfg, self.seed, 0)
+        self.p2 = Player(3 * cfg.WIDTH // 4, cfg.HEIGHT // 2, img2, cfg.COLORS['p2'], name2, cfg, self.seed, 1)
+        self.ball = Ball(cfg.WIDTH // 2, cfg.HEIGHT // 2, cfg, self.seed)
+        self.frame_index = 0
+        self.state = "playing"
+        self.winner = None
+        # Événements sonores (frame, nom du bruitage), mixés hors-ligne après le rendu
+        self.events = []
+        # Effets visuels
+        self.shake_offset = [0, 0]
+        self.flash_alpha = 0
+        self.score_flash_timer = 0
+        self.score_flash_color = (255,255,255)
+        # Couches du rendu : fond statique, UI semi-statique (refaite si son état change)
+        self._bg_layer = None
+        # Canevas avec une marge de tremblement : la frame est sa fenêtre centrale (`screen`)
+        # et la scène secouée y est dessinée décalée, sans surface temporaire
+        self._margin = cfg.SHAKE_INTENSITY if cfg.SHAKE else 0
+        self._canvas = pygame.Surface((cfg.WIDTH + 2 * self._margin, cfg.HEIGHT + 2 * self._margin))
+        self.screen = self._canvas.subsurface((self._margin, self._margin, cfg.WIDTH, cfg.HEIGHT))
+        self._solid_layers = {}
+    def check_collisions(self):
+        for pl in [self.p1, self.p2]:
+            if (self.ball.pos - pl.pos).length() < (pl.radius + self.ball.radius):
+                direction = (self.ball.pos - pl.pos)
+                if direction.length() == 0:
+                    direction = pygame.Vector2(1, 0)
+                direction = direction.normalize()
+                self.ball.vel = direction * (28 if self.cfg.ULTRA_FAST else 15)
+                pl.score += 1
+                count = (36 if self.cfg.COLORFUL_PARTICLES else 18) * self.cfg.PARTICLE_SCALE
+                pl.particles.emit(self.ball.pos.x, self.ball.pos.y, count, None if self.cfg.COLORFUL_PARTICLES else pl.color)
+                pl.anim += 18
+                if self.cfg.FLASH:
+                    self.flash_alpha = self.cfg.FLASH_INTENSITY
+                if self.cfg.SHAKE:
+                    self.shake_offset[0] = self.rng.randint(-self.cfg.SHAKE_INTENSITY,self.cfg.SHAKE_INTENSITY)
+                    self.shake_offset[1] = self.rng.randint(-self.cfg.SHAKE_INTENSITY,self.cfg.SHAKE_INTENSITY)
+                self.score_flash_timer = self.cfg.SCORE_FLASH_DURATION
+                self.score_flash_color = tuple(self.rng.randint(180,255) for _ in range(3))
+                self.events.append((self.frame_index, "hit"))
+    def update(self):
+        # Les événements portent l'indice de la frame rendue après cet update ;
+        # le tick physique (1, 2, ...) est celui de `simulate_duels`
+        for pl in (self.p1, self.p2):
+            if pl.auto_control(self.frame_index + 1):
+                self.events.append((self.frame_index, "special"))
+        self.p1.update()
+        self.p2.update()
+        self.ball.update()
+        self.check_collisions()
+        if self.shake_offset[0] != 0 or self.shake_offset[1] != 0:
+            self.shake_offset[0] = int(self.shake_offset[0]*0.7)
+            self.shake_offset[1] = int(self.shake_offset[1]*0.7)
+            if abs(self.shake_offset[0]) < 2: self.shake_offset[0]=0
+            if abs(self.shake_offset[1]) < 2: self.shake_offset[1]=0
+        if self.flash_alpha > 0:
+            self.flash_alpha = int(self.flash_alpha*0.85)
+        if self.score_flash_timer > 0:
+            self.score_flash_timer -= 1
+        if self.p1.score >= self.cfg.WIN_SCORE or self.p2.score >= self.cfg.WIN_SCORE:
+            if self.state != "game_over":
+                self.events.append((self.frame_index, "win"))
+            self.state = "game_over"
+            self.winner = self.p1.name if self.p1.score >= self.cfg.WIN_SCORE else self.p2.name
+        self.frame_index += 1
+    def snapshot(self):
+        """État complet après `update()` (picklable) : reprendre ici redonne les mêmes frames."""
+        return {
+            'frame_index': self.frame_index, 'state': self.state, 'winner': self.winner,
+            'events': list(self.events), 'rng': self.rng.getstate(),
+            'shake_offset': list(self.shake_offset), 'flash_alpha': self.flash_alpha,
+            'score_flash_timer': self.score_flash_timer, 'score_flash_color': self.score_flash_color,
+            'p1': self.p1.snapshot(), 'p2': self.p2.snapshot(), 'ball': self.ball.snapshot(),
+        }
+    def restore(self, snap):
+        self.frame_index = snap['frame_index']
+        self.state = snap['state']
+        self.winner = snap['winner']
+        self.events = list(snap['events'])
+        self.rng.setstate(snap['rng'])
+        self.shake_offset = list(snap['shake_offset'])
+        self.flash_alpha = snap['flash_alpha']
+        self.score_flash_timer = snap['score_flash_timer']
+        self.score_flash_color = snap['score_flash_color']
+        self.p1.restore(snap['p1'])
+        self.p2.restore(snap['p2'])
+        self.ball.restore(snap['ball'])
+    def solid_layer(self, color, alpha):
+        """Aplat plein écran alloué une fois par couleur ; seule son opacité globale change."""
+        layer = self._solid_layers.get(color)
+        if layer is None:
+            layer = self._solid_layers[color] = pygame.Surface((self.cfg.WIDTH, self.cfg.HEIGHT))
+            layer.fill(color)
+        layer.set_alpha(alpha)
+        return layer
+    def paint_background(self, surface):
+        for y in range(0, self.cfg.HEIGHT, 4):
+            ratio = y / self.cfg.HEIGHT
+            r = int(15 + 20 * ratio)
+            g = int(15 + 30 * ratio)
+            b = int(35 + 40 * ratio)
+            pygame.draw.rect(surface, (r, g, b), (0, y, self.cfg.WIDTH, 4))
+        for x in range(0, self.cfg.WIDTH, 50):
+            pygame.draw.line(surface, (50, 50, 70), (x, 0), (x, self.cfg.HEIGHT), 1)
+        for y in range(0, self.cfg.HEIGHT, 50):
+            pygame.draw.line(surface, (50, 50, 70), (0, y), (self.cfg.WIDTH, y), 1)
+    def draw_background(self, surface):
+        # Le dégradé et la grille ne changent jamais : une seule rastérisation
+        if self._bg_layer is None:
+            self._bg_layer = pygame.Surface((self.cfg.WIDTH, self.cfg.HEIGHT))
+            self.paint_background(self._bg_layer)
+        surface.blit(self._bg_layer, (0, 0))
+    def ui_state(self):
+        """Tout ce dont dépend l'UI (scores, noms, pulsations, couleurs, titre)."""
+        s_pulse = 1.3 if self.cfg.SCORE_PULSE and self.p1.anim > 0 else 1.0
+        m_pulse = 1.3 if self.cfg.SCORE_PULSE and self.p2.anim > 0 else 1.0
+        s_col = self.score_flash_color if self.score_flash_timer > 0 else self.cfg.COLORS['p1']
+        m_col = self.score_flash_color if self.score_flash_timer > 0 else self.cfg.COLORS['p2']
+        # Pendant le rendu de la frame i, `frame_index` vaut i + 1 (updates déjà joués)
+        title = self.frame_index < self.cfg.TITLE_DURATION * self.cfg.FPS
+        return (self.p1.score, self.p2.score, self.p1.name, self.p2.name,
+                s_pulse, m_pulse, s_col, m_col, title)
+    def paint_ui(self, surface, state):
+        s_score_val, m_score_val, s_name_val, m_name_val, s_pulse, m_pulse, s_col, m_col, title = state
+        # Scores (pulse animé + flash couleur)
+        s_score = render_text(get_font(120), f"{s_score_val}", s_col, (int(120*s_pulse), int(120*s_pulse)))
+        m_score = render_text(get_font(120), f"{m_score_val}", m_col, (int(120*m_pulse), int(120*m_pulse)))
+        surface.blit(s_score, (self.cfg.WIDTH // 4 - s_score.get_width() // 2, 100))
+        surface.blit(m_score, (3 * self.cfg.WIDTH // 4 - m_score.get_width() // 2, 100))
+        # Noms dynamiques
+        s_name = render_text(get_font(80), s_name_val, self.cfg.COLORS['text'])
+        m_name = render_text(get_font(80), m_name_val, self.cfg.COLORS['text'])
+        surface.blit(s_name, (self.cfg.WIDTH // 4 - s_name.get_width() // 2, 50))
+        surface.blit(m_name, (3 * self.cfg.WIDTH // 4 - m_name.get_width() // 2, 50))
+        pygame.draw.line(surface, self.cfg.COLORS['text'], (self.cfg.WIDTH // 2, 0), (self.cfg.WIDTH // 2, self.cfg.HEIGHT), 3)
+        # Titre overlay au début
+        if title:
+            title1 = render_text(get_font(120), f"{s_name_val} vs {m_name_val}", self.cfg.COLORS['accent'])
+            title2 = render_text(get_font(80), "DUEL HYPNOTIQUE !", self.cfg.COLORS['text'])
+            cx = self.cfg.WIDTH // 2
+            cy = self.cfg.HEIGHT // 2
+            surface.blit(title1, (cx - title1.get_width() // 2, cy - 100))
+            surface.blit(title2, (cx - title2.get_width() // 2, cy - 10))
+    def draw_ui(self, surface):
+        # Textes tracés directement sur la scène (sprites déjà en cache) : une couche
+        # intermédiaire transparente appliquerait deux fois l'alpha des bords anticrénelés
+        self.paint_ui(surface, self.ui_state())
+        # Game over overlay
+        if self.state == "game_over":
+            surface.blit(self.solid_layer((0, 0, 0), 140), (0, 0))
+            winner = render_text(get_font(120), f"{self.winner} WINS!", self.cfg.COLORS['accent'])
+            surface.blit(winner, (self.cfg.WIDTH // 2 - winner.get_width() // 2, self.cfg.HEIGHT // 2 - 80))
+    def render_frame(self, surface=None):
+        """Rend la frame dans `self.screen` (recopiée dans `surface` si fournie) et la renvoie."""
+        # Décalage shake : la scène est dessinée dans une fenêtre décalée du canevas ;
+        # la bande découverte garde la frame précédente, comme avant
+        dx, dy = self.shake_offset if self.cfg.SHAKE else (0, 0)
+        if dx or dy:
+            scene = self._canvas.subsurface((self._margin + dx, self._margin + dy, self.cfg.WIDTH, self.cfg.HEIGHT))
+        else:
+            scene = self.screen
+        self.draw_background(scene)
+        self.ball.draw(scene)
+        self.p1.draw(scene)
+        self.p2.draw(scene)
+        self.draw_ui(scene)
+        # Flash d'écran
+        if self.cfg.FLASH and self.flash_alpha > 0:
+            self.screen.blit(self.solid_layer((255, 255, 255), self.flash_alpha), (0, 0))
+        if surface is not None:
+            surface.blit(self.screen, (0, 0))
+        return self.screen
+
+# =========================
+# Simulation headless : recherche de graine
+# =========================
+# Flux du générateur à compteur (un par tirage physique, décalé par joueur)
+_RNG_BALL_X, _RNG_BALL_Y = 0, 1
+_RNG_JITTER_X, _RNG_JITTER_Y, _RNG_SPECIAL = 2, 4, 6
+
+def _mix64(z):
+    """Finaliseur splitmix64 sur des uint64 (débordements voulus)."""
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+def sim_uniform(seed, frame, stream, lo=0.0, hi=1.0):
+    """Tirage uniforme dans [lo, hi) fonction pure de (graine, frame, flux).
+
+    Vectorisé sur `seed` : le même appel sert au `Game` (un match) et à
+    `simulate_duels` (des milliers de graines), avec des tirages identiques.
+    """
+    with np.errstate(over='ignore'):
+        key = np.asarray(seed, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        z = _mix64(key ^ np.asarray((frame << 8) | stream, dtype=np.uint64))
+    u = (z >> np.uint64(11)) * (1.0 / (1 << 53))
+    value = lo + (hi - lo) * u
+    return float(value) if np.ndim(value) == 0 else value
+
+def simulate_duels(seeds, frames=None, cfg=None):
+    """Rejoue la physique de `Game.update` pour un lot de graines, sans rendu.
+
+    Renvoie un dict de tableaux (une case par graine) : coups, spéciales,
+    scores finaux, frame de victoire (-1 si aucune), moments serrés (coup
+    laissant un écart <= 1), changements de meneur et frame où la balle
+    quitte le terrain (-1 si jamais).
+    """
+    cfg = cfg or CFG
+    frames = int(cfg.DURATION * cfg.FPS) if frames is None else frames
+    seeds = np.asarray(seeds, dtype=np.uint64)
+    n = len(seeds)
+    W, H = cfg.WIDTH, cfg.HEIGHT
+    p_radius, b_radius = 40, 14
+    p_speed = 1.7 if cfg.ULTRA_FAST else 1
+    b_speed = 1.6 if cfg.ULTRA_FAST else 1
+    bounce = -1.18 if cfg.ULTRA_FAST else -1
+    kick = 28 if cfg.ULTRA_FAST else 15
+    # Joueurs : axe 0 = joueur, axe 1 = graine
+    px = np.array([[W // 4], [3 * W // 4]], dtype=float).repeat(n, 1)
+    py = np.full((2, n), float(H // 2))
+    pvx = np.zeros((2, n))
+    pvy = np.zeros((2, n))
+    boost = np.ones((2, n))
+    cooldown = np.zeros((2, n), dtype=np.int64)
+    ready = np.ones((2, n), dtype=bool)
+    score = np.zeros((2, n), dtype=np.int64)
+    bx = np.full(n, float(W // 2))
+    by = np.full(n, float(H // 2))
+    bvx = sim_uniform(seeds, 0, _RNG_BALL_X, -8, 8)
+    bvy = sim_uniform(seeds, 0, _RNG_BALL_Y, -8, 8)
+    stats = {
+        'seed': seeds,
+        'hits': np.zeros(n, dtype=np.int64),
+        'specials': np.zeros(n, dtype=np.int64),
+        'win_frame': np.full(n, -1, dtype=np.int64),
+        'close_moments': np.zeros(n, dtype=np.int64),
+        'lead_changes': np.zeros(n, dtype=np.int64),
+        'escape_frame': np.full(n, -1, dtype=np.int64),
+    }
+    leader = np.zeros(n, dtype=np.int64)
+    lanes = np.arange(2)[:, None]
+    with np.errstate(over='ignore', invalid='ignore'):
+        for f in range(1, frames + 1):
+            # Player.auto_control
+            if f % 10 == 0:
+                pvx = np.clip(pvx + sim_uniform(seeds, f, _RNG_JITTER_X + lanes, -6, 6), -12, 12)
+                pvy = np.clip(pvy + sim_uniform(seeds, f, _RNG_JITTER_Y + lanes, -6, 6), -12, 12)
+            if f % 40 == 0:
+                fire = (sim_uniform(seeds, f, _RNG_SPECIAL + lanes) < 0.18) & ready & (cooldown <= 0)
+                ready &= ~fire
+                cooldown[fire] = 40
+                boost[fire] = 3.0
+                stats['specials'] += fire.sum(0)
+            # Player.update
+            pvx *= 0.87
+            pvy *= 0.87
+            px = np.clip(px + pvx * boost * p_speed, p_radius, W - p_radius)
+            py = np.clip(py + pvy * boost * p_speed, p_radius, H - p_radius)
+            cooling = cooldown > 0
+            recharge = ~cooling & ~ready
+            cooldown[cooling] -= 1
+            ready |= recharge
+            boost[recharge] = 1.0
+            # Ball.update
+            bx += bvx * b_speed
+            by += bvy * b_speed
+            bvx = np.where((bx < b_radius) | (bx > W - b_radius), bvx * bounce, bvx)
+            bvy = np.where((by < b_radius) | (by > H - b_radius), bvy * bounce, bvy)
+            # Game.check_collisions (joueur 1 puis joueur 2, comme dans le jeu)
+            hit_any = np.zeros(n, dtype=bool)
+            for k in range(2):
+                dx = bx - px[k]
+                dy = by - py[k]
+                dist = np.sqrt(dx * dx + dy * dy)
+                hit = dist < p_radius + b_radius
+                if not hit.any():
+                    continue
+                still = dist == 0
+                safe = np.where(still, 1.0, dist)
+                bvx = np.where(hit, np.where(still, 1.0, dx / safe) * kick, bvx)
+                bvy = np.where(hit, np.where(still, 0.0, dy / safe) * kick, bvy)
+                score[k] += hit
+                stats['hits'] += hit
+                hit_any |= hit
+            if hit_any.any():
+                gap = score[0] - score[1]
+                playing = stats['win_frame'] < 0
+                stats['close_moments'] += hit_any & playing & (np.abs(gap) <= 1)
+                lead = np.sign(gap)
+                stats['lead_changes'] += hit_any & playing & (lead != 0) & (leader != 0) & (lead != leader)
+                leader = np.where(lead != 0, lead, leader)
+                won = playing & (score.max(0) >= cfg.WIN_SCORE)
+                stats['win_frame'][won] = f
+            out = (np.abs(bx - W / 2) > W) | (np.abs(by - H / 2) > H) | ~np.isfinite(bx + by)
+            stats['escape_frame'][out & (stats['escape_frame'] < 0)] = f
+    stats['score1'], stats['score2'] = score
+    return stats
+
+def viral_score(stats, frames=None, cfg=None):
+    """Note de « viralité » : victoire dans le temps imparti, tardive, disputée, balle restée en jeu."""
+    cfg = cfg or CFG
+    frames = int(cfg.DURATION * cfg.FPS) if frames is None else frames
+    won = stats['win_frame'] >= 0
+    lateness = np.where(won, stats['win_frame'] / frames, 0.0)
+    return (won * (100 - 60 * np.abs(lateness - 0.85))
+            + 10 * stats['lead_changes'] + 4 * stats['close_moments']
+            + 0.5 * stats['hits'] + 2 * stats['specials']
+            - 1000 * (stats['escape_frame'] >= 0))
+
+def pick_viral_seed(count=None, frames=None, cfg=None, base=None):
+    """Simule `count` graines consécutives et renvoie (graine, stats) du match le plus « viral »."""
+    cfg = cfg or CFG
+    count = count or cfg.SEED_CANDIDATES
+    base = random.getrandbits(32) if base is None else base
+    stats = simulate_duels(np.arange(base, base + count), frames, cfg)
+    best = int(np.argmax(viral_score(stats, frames, cfg)))
+    return int(stats['seed'][best]), {k: v[best].item() for k, v in stats.items()}
+
+# =========================
+# Audio : musique auto (beat synthé)
+# =========================
+def make_music(t_array, rng=None):
+    rng = np.random if rng is None else rng
+    bpm = 120.0
+    beat_t = 60.0 / bpm
+    t = t_array
+    kick_env = np.exp(-t % beat_t * 12.0)
+    kick = np.sin(2 * np.pi * 50 * t) * kick_env
+    beat_idx = np.floor((t / beat_t) % 4)
+    snare_gate = ((beat_idx == 1) | (beat_idx == 3)).astype(float)
+    snare = snare_gate * (rng.uniform(-1, 1, size=t.shape) * np.exp(-((t % beat_t) * 20)))
+    hat_gate = ((np.floor((t / (beat_t / 2)) % 2)) == 0).astype(float)
+    hat = hat_gate * (rng.uniform(-1, 1, size=t.shape) * 0.3) * np.exp(-((t % (beat_t / 2)) * 40))
+    note_period = 2.0
+    note_idx = np.floor(t / note_period) % 4
+    freqs = np.array([55, 65.4, 73.4, 82.4])
+    f = freqs[note_idx.astype(int)]
+    bass = 0.2 * np.sin(2 * np.pi * f * t) * np.exp(-((t % note_period) * 0.6))
+    mix = kick * 0.8 + snare * 0.5 + hat * 0.3 + bass * 0.9
+    mix = np.tanh(mix * 1.5).astype(np.float32)
+    return mix
+
+def music_frame(t):
+    if np.isscalar(t):
+        t = np.array([t], dtype=np.float32)
+    return make_music(t)
+
+def render_music(duration, rate=None, seed=0):
+    """Rend `make_music` sur toute la durée, par blocs vectorisés de `AUDIO_BLOCK` échantillons."""
+    rate = rate or CFG.AUDIO_RATE
+    total = int(round(duration * rate))
+    track = np.empty(total, dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    for start in range(0, total, CFG.AUDIO_BLOCK):
+        stop = min(total, start + CFG.AUDIO_BLOCK)
+        track[start:stop] = make_music(np.arange(start, stop) / rate, rng)
+    return track
+
+_SFX_BANK = {}
+
+def sfx_bank(rate=None):
+    """Bruitages pré-calculés (une fois par fréquence d'échantillonnage)."""
+    rate = rate or CFG.AUDIO_RATE
+    if rate not in _SFX_BANK:
+        rng = np.random.default_rng(7)
+        def span(seconds):
+            return np.arange(int(seconds * rate)) / rate
+        def sweep(freq):
+            # Fréquence instantanée -> phase intégrée
+            return np.sin(2 * np.pi * np.cumsum(freq) / rate)
+        t = span(0.1)
+        hit = 0.5 * np.sin(2 * np.pi * 440 * t) * np.exp(-t * 25)
+        t = span(0.35)
+        special = 0.5 * sweep(300 + 900 * t / 0.35) * (1 - t / 0.35)
+        t = span(0.15)
+        win = np.concatenate([0.45 * np.sin(2 * np.pi * f * t) * np.exp(-t * 10) for f in (523.3, 659.3, 784.0)])
+        t = span(0.6)
+        boing = 0.6 * sweep(150 * (1 + 0.5 * np.sin(2 * np.pi * 8 * t) * np.exp(-t * 3))) * np.exp(-t * 3)
+        t = span(0.4)
+        kernel = np.ones(32) / 32
+        pouf = 2.5 * np.convolve(rng.uniform(-1, 1, len(t)), kernel, mode='same') * np.exp(-t * 8)
+        t = span(0.15)
+        tchak = 0.5 * rng.uniform(-1, 1, len(t)) * np.exp(-t * 60) + 0.4 * np.sin(2 * np.pi * 2000 * t) * np.exp(-t * 40)
+        _SFX_BANK[rate] = {name: snd.astype(np.float32) for name, snd in
+                           dict(hit=hit, special=special, win=win, boing=boing, pouf=pouf, tchak=tchak).items()}
+    return _SFX_BANK[rate]
+
+def mix_audio(duration, events, fps, rate=None):
+    """Musique + bruitages posés aux instants `frame / fps` des événements."""
+    rate = rate or CFG.AUDIO_RATE
+    track = render_music(duration, rate) * CFG.MUSIC_GAIN
+    bank = sfx_bank(rate)
+    for frame, name in events:
+        start = int(frame * rate / fps)
+        if start >= len(track):
+            continue
+        sound = bank[name][:len(track) - start]
+        track[start:start + len(sound)] += sound * CFG.SFX_GAIN
+    return np.clip(track, -1, 1)
+
+def write_wav(path, samples, rate=None):
+    """WAV mono 16 bits."""
+    pcm = (np.clip(samples, -1, 1) * 32767).astype('<i2')
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate or CFG.AUDIO_RATE)
+        wav.writeframes(pcm.tobytes())
+
+def _ffmpeg_exe():
+    """ffmpeg du PATH, sinon celui fourni par imageio-ffmpeg s'il est installé."""
+    exe = shutil.which("ffmpeg")
+    if exe is None and importlib.util.find_spec("imageio_ffmpeg") is not None:
+        import imageio_ffmpeg
+        exe = imageio_ffmpeg.get_ffmpeg_exe()
+    return exe
+
+def mux_audio(video_path, wav_path):
+    """Ajoute la piste WAV à la vidéo sans réencoder l'image (`-c:v copy`)."""
+    exe = _ffmpeg_exe()
+    if exe is None:
+        print("⚠️  ffmpeg introuvable : vidéo laissée muette")
+        return False
+    video_path = Path(video_path)
+    muxed = video_path.with_name(video_path.stem + ".mux" + video_path.suffix)
+    cmd = [exe, "-y", "-loglevel", "error", "-i", str(video_path), "-i", str(wav_path),
+           "-map", "0:v:0", "-map", "1:a:0", "-c:v", "copy", "-c:a", "aac", "-b:a", "160k",
+           "-shortest", "-movflags", "+faststart", str(muxed)]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"⚠️  Mux audio impossible : {result.stderr.strip()[-300:]}")
+        muxed.unlink(missing_ok=True)
+        return False
+    os.replace(muxed, video_path)
+    return True
+
+def add_soundtrack(video_path, duration, events, fps):
+    """Synthétise la piste (musique + bruitages), l'écrit en WAV et la muxe dans la vidéo."""
+    if not CFG.AUDIO:
+        return False
+    wav_path = Path(video_path).with_suffix(".wav")
+    write_wav(wav_path, mix_audio(duration, events, fps))
+    try:
+        ok = mux_audio(video_path, wav_path)
+    finally:
+        wav_path.unlink(missing_ok=True)
+    if ok:
+        print(f"🔊 Piste audio ajoutée ({len(events)} bruitages)")
+    return ok
+
+# =========================
+# Pipeline rendu (frames -> PNG -> vidéo)
+# =========================
+def _ebml_size(n):
+    return (0x01 << 56 | n).to_bytes(8, 'big')
+
+def _ebml(eid, payload):
+    """Élément EBML : identifiant, taille sur 8 octets puis contenu."""
+    return eid + _ebml_size(len(payload)) + payload
 
-        # 2. Essayer avec une approche alternative pour Unsplash
+def _ebml_uint(value):
+    return value.to_bytes(max(1, (value.bit_length() + 7) // 8), 'big')
+
+def matroska_header(size, fps):
+    """En-tête d'un flux Matroska à une piste vidéo brute BGR 24 bits.
+
+    L'unité de temps vaut une frame : l'horodatage d'un bloc est son numéro de frame.
+    """
+    w, h = size
+    tick = round(1e9 / fps)  # nanosecondes
+    video = _ebml(b'\xe0', _ebml(b'\xb0', _ebml_uint(w)) + _ebml(b'\xba', _ebml_uint(h))
+                  + _ebml(b'\x2e\xb5\x24', b'BGR\x18'))
+    track = _ebml(b'\xae', _ebml(b'\xd7', _ebml_uint(1)) + _ebml(b'\x73\xc5', _ebml_uint(1))
+                  + _ebml(b'\x83', _ebml_uint(1)) + _ebml(b'\x86', b'V_UNCOMPRESSED')
+                  + _ebml(b'\x23\xe3\x83', _ebml_uint(tick)) + video)
+    return (_ebml(b'\x1a\x45\xdf\xa3', _ebml(b'\x42\x82', b'matroska') + _ebml(b'\x42\x87', _ebml_uint(4))
+                  + _ebml(b'\x42\x85', _ebml_uint(2)))
+            + b'\x18\x53\x80\x67' + b'\x01\xff\xff\xff\xff\xff\xff\xff'  # segment de taille inconnue
+            + _ebml(b'\x15\x49\xa9\x66', _ebml(b'\x2a\xd7\xb1', _ebml_uint(tick)))
+            + _ebml(b'\x16\x54\xae\x6b', track))
+
+def matroska_block(index, nbytes):
+    """Cluster contenant une seule image clé de `nbytes` octets à la frame `index` (données à suivre)."""
+    timecode = _ebml(b'\xe7', _ebml_uint(index))
+    block = b'\xa3' + _ebml_size(4 + nbytes) + b'\x81\x00\x00\x80'
+    return b'\x1f\x43\xb6\x75' + _ebml_size(len(timecode) + len(block) + nbytes) + timecode + block
+
+class VideoWriter:
+    """Base des encodeurs : en contexte, `release` en sortie normale, `abort` sur exception."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.release()
+        else:
+            self.abort()
+        return False
+
+    def abort(self):
+        """Libère l'encodeur et supprime la vidéo incomplète, sans masquer l'erreur en cours."""
         try:
-            print(f"    📥 Tentative Unsplash alternative...")
-            # Utiliser une URL différente pour Unsplash
-            unsplash_url = f"https://source.unsplash.com/featured/400x400/?{requests.utils.quote(query + ' person face portrait')}"
-
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'DNT': '1',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            }
-
-            response = requests.get(unsplash_url, timeout=15, headers=headers, allow_redirects=True)
-
-            if response.status_code == 200 and response.headers.get('content-type', '').startswith('image/'):
-                img_data = response.content
-
-                # Vérifier si c'est une image valide
-                from PIL import Image
-                import io
-
-                try:
-                    img = Image.open(io.BytesIO(img_data))
-                    img.verify()
-                    img.close()
-
-                    # Recharger et traiter l'image
-                    img = Image.open(io.BytesIO(img_data)).convert('RGBA')
-                    img = img.resize((400, 400), Image.Resampling.LANCZOS)
-                    img.save(filename, 'PNG')
-                    print(f"    ✅ Image téléchargée avec succès: {filename}")
-                    return True
-                except Exception as e:
-                    print(f"    ⚠️  Format d'image non reconnu: {e}")
-            else:
-                print(f"    ⚠️  Réponse non-image (status: {response.status_code})")
+            self.release()
+        except Exception:
+            pass
+        Path(self.path).unlink(missing_ok=True)
 
-        except Exception as e:
-            print(f"    ⚠️  Échec Unsplash: {e}")
+class FFmpegWriter(VideoWriter):
+    """Envoie les frames BGR brutes sur l'entrée standard d'un ffmpeg (H.264 yuv420p par défaut).
 
-        # 3. Essayer avec une recherche Google Images alternative
+    Avec `hold=True`, les frames sont horodatées (flux Matroska brut) et une frame
+    tenue n'est encodée qu'une fois : la vidéo produite est à fréquence variable.
+    """
+    def __init__(self, path, fps, size, codec=None, preset=None, crf=None, threads=None, hold=False):
+        w, h = size
+        codec = codec or CFG.VIDEO_CODEC
+        preset = preset or CFG.VIDEO_PRESET
+        crf = CFG.VIDEO_CRF if crf is None else crf
+        threads = CFG.VIDEO_THREADS if threads is None else threads
+        cmd = [_ffmpeg_exe(), "-y", "-loglevel", "error"]
+        if hold:
+            cmd += ["-f", "matroska", "-i", "-"]
+        else:
+            cmd += ["-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{w}x{h}", "-r", str(fps), "-i", "-"]
+        cmd += ["-an", "-c:v", codec]
+        if preset:
+            cmd += ["-preset", preset]
+        if crf is not None:
+            cmd += ["-crf", str(crf)]
+        if hold:
+            # Sans B-frames : avec des sauts d'horodatage, la durée écrite dans le mp4 serait fausse
+            cmd += ["-fps_mode", "vfr", "-bf", "0"]
+        cmd += ["-pix_fmt", "yuv420p", "-threads", str(threads), "-movflags", "+faststart", str(path)]
+        self.path = path
+        self.timestamps = hold
+        self.frames = 0
+        self.log = tempfile.TemporaryFile()
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=self.log)
+        if hold:
+            self.proc.stdin.write(matroska_header(size, fps))
+
+    def write(self, frame):
+        self.hold(frame, 1)
+
+    def hold(self, frame, count):
+        """Affiche `frame` pendant `count` frames."""
+        data = memoryview(np.ascontiguousarray(frame)).cast('B')
+        try:
+            if self.timestamps:
+                # Début et dernière frame du plan : ffmpeg n'a rien à encoder entre les deux
+                for index in sorted({self.frames, self.frames + count - 1}):
+                    self.proc.stdin.write(matroska_block(index, len(data)))
+                    self.proc.stdin.write(data)
+            else:
+                for _ in range(count):
+                    self.proc.stdin.write(data)
+        except BrokenPipeError:
+            # ffmpeg s'est arrêté : remonter son message d'erreur plutôt que le tube cassé
+            self.release()
+            raise
+        self.frames += count
+
+    def release(self):
+        if self.proc.stdin.closed:
+            return
         try:
-            print(f"    📥 Tentative recherche alternative...")
-            # Utiliser une approche différente - essayer de télécharger depuis un service d'images gratuit
-            alternative_url = f"https://picsum.photos/400/400?random={hash(query) % 1000}"
+            self.proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        code = self.proc.wait()
+        self.log.seek(0)
+        err = self.log.read().decode(errors='replace').strip()
+        self.log.close()
+        if code != 0:
+            raise RuntimeError(f"ffmpeg a échoué ({code}) : {err[-300:]}")
 
-            response = requests.get(alternative_url, timeout=10, headers=headers)
+    def abort(self):
+        # ffmpeg finaliserait un mp4 tronqué : l'arrêter avant de fermer son entrée
+        if self.proc.poll() is None:
+            self.proc.kill()
+        super().abort()
 
-            if response.status_code == 200:
-                img_data = response.content
+class OpenCVWriter(VideoWriter):
+    """Repli sans ffmpeg : `cv2.VideoWriter` en mp4v."""
+    def __init__(self, path, fps, size):
+        self.path = path
+        self.writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, size)
 
-                try:
-                    img = Image.open(io.BytesIO(img_data))
-                    img.verify()
-                    img.close()
+    def write(self, frame):
+        self.writer.write(frame)
 
-                    img = Image.open(io.BytesIO(img_data)).convert('RGBA')
-                    img = img.resize((400, 400), Image.Resampling.LANCZOS)
-                    img.save(filename, 'PNG')
-                    print(f"    ✅ Image alternative téléchargée: {filename}")
-                    return True
-                except Exception as e:
-                    print(f"    ⚠️  Format d'image alternative non reconnu: {e}")
+    def hold(self, frame, count):
+        for _ in range(count):
+            self.writer.write(frame)
 
-        except Exception as e:
-            print(f"    ⚠️  Échec recherche alternative: {e}")
+    def release(self):
+        self.writer.release()
+
+def open_video_writer(path, fps, size, hold=False):
+    """Encodeur choisi par `CFG.VIDEO_ENCODER` ; OpenCV si ffmpeg est absent.
+
+    `hold` : les frames tenues (`writer.hold`) ne sont encodées qu'une fois (ffmpeg seulement).
+    """
+    if CFG.VIDEO_ENCODER != "opencv":
+        if _ffmpeg_exe() is not None:
+            return FFmpegWriter(path, fps, size, hold=hold)
+        if CFG.VIDEO_ENCODER == "ffmpeg":
+            print("⚠️  ffmpeg introuvable : encodage OpenCV (mp4v) à la place")
+    return OpenCVWriter(path, fps, size)
 
+def surface_bgr(surface):
+    """Vue (h, w, 3) BGR ligne par ligne des pixels de `surface`, sans copie.
+
+    Une surface 32 bits XRGB sur machine little-endian range déjà ses octets
+    en B, G, R, X : il suffit d'ignorer le 4e octet. Renvoie None pour tout
+    autre format. La surface reste verrouillée tant que la vue existe.
+    """
+    if surface.get_bytesize() != 4 or surface.get_shifts()[:3] != (16, 8, 0) or sys.byteorder != 'little':
+        return None
+    w, h = surface.get_size()
+    raw = np.frombuffer(surface.get_buffer(), dtype=np.uint8)
+    return raw.reshape(h, surface.get_pitch())[:, :4 * w].reshape(h, w, 4)[..., :3]
+
+def copy_frame_bgr(surface, out):
+    """Copie la frame dans le tampon `out` (h, w, 3) BGR en une seule passe."""
+    view = surface_bgr(surface)
+    if view is None:
+        view = pygame.surfarray.pixels3d(surface).transpose(1, 0, 2)[..., ::-1]
+    np.copyto(out, view)
+    del view  # déverrouille la surface avant le prochain blit
+    return out
+
+class FramePipeline:
+    """Rendu et encodage en parallèle.
+
+    Le rendu prend un tampon libre (`acquire`), y copie la frame et le soumet
+    (`submit`) ; un thread dédié le passe à `write` puis le remet en circulation.
+    Les deux files sont bornées par `depth` : pas d'allocation par frame et
+    le rendu attend si l'encodeur prend du retard. Une frame soumise avec
+    `count > 1` est passée une seule fois à `hold(frame, count)`.
+    """
+    def __init__(self, write, shape, depth=None, hold=None):
+        depth = depth or CFG.PIPELINE_DEPTH
+        self.write = write
+        self.hold = hold
+        self.error = None
+        self.free = queue.Queue()
+        for _ in range(depth):
+            self.free.put(np.empty(shape, dtype=np.uint8))
+        self.pending = queue.Queue(maxsize=depth)
+        self.thread = threading.Thread(target=self._encode, name="encoder", daemon=True)
+        self.thread.start()
+
+    def _encode(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            frame, count = item
+            try:
+                if self.error is None:
+                    if count == 1:
+                        self.write(frame)
+                    elif self.hold is not None:
+                        self.hold(frame, count)
+                    else:
+                        for _ in range(count):
+                            self.write(frame)
+            except Exception as e:
+                self.error = e
+            finally:
+                self.free.put(frame)
+
+    def acquire(self):
+        frame = self.free.get()
+        if self.error is not None:
+            raise self.error
+        return frame
+
+    def submit(self, frame, count=1):
+        self.pending.put((frame, count))
+
+    def close(self):
+        self.pending.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.pending.put(None)
+            self.thread.join()
         return False
 
+def frame_runs(frames):
+    """Regroupe les frames consécutives identiques en couples (frame, nombre).
+
+    Un générateur déclare un plan fixe en renvoyant plusieurs fois le même
+    tableau (sans le modifier) : la comparaison par identité ne coûte rien.
+    """
+    run, count = None, 0
+    for frame in frames:
+        if frame is run:
+            count += 1
+            continue
+        if count:
+            yield run, count
+        run, count = frame, 1
+    if count:
+        yield run, count
+
+def choose_seed(seed, total_frames):
+    """Graine imposée, sinon la plus « virale » parmi `SEED_CANDIDATES` matchs simulés."""
+    if seed is None and CFG.SEED_CANDIDATES:
+        seed, stats = pick_viral_seed(frames=total_frames)
+        print(f"🎲 Graine {seed} retenue parmi {CFG.SEED_CANDIDATES} matchs simulés "
+              f"({stats['score1']}-{stats['score2']}, victoire frame {stats['win_frame']}, "
+              f"{stats['lead_changes']} changements de meneur)")
+    return seed
+
+def render_video(seed=None, workers=None, output=None):
+    workers = workers or CFG.RENDER_WORKERS
+    if workers > 1:
+        if _ffmpeg_exe() is not None:
+            return render_video_parallel(seed, workers, output)
+        print("⚠️  ffmpeg introuvable (concaténation impossible) : rendu en série")
+    if CFG.FRAMES_DIR.exists():
+        shutil.rmtree(CFG.FRAMES_DIR)
+    CFG.FRAMES_DIR.mkdir(parents=True, exist_ok=True)
+    total_frames = int(CFG.DURATION * CFG.FPS)
+    seed = choose_seed(seed, total_frames)
+    game = Game(CFG, seed)
+    print("🎮 Génération en cours...")
+    
+    output_filename = output or CFG.OUTPUT_FILE
+    # Le rendu de la frame suivante chevauche l'encodage de la précédente
+    with open_video_writer(output_filename, CFG.FPS, (CFG.WIDTH, CFG.HEIGHT)) as out, \
+            FramePipeline(out.write, (CFG.HEIGHT, CFG.WIDTH, 3)) as pipeline:
+        for i in range(total_frames):
+            game.update()
+            frame = game.render_frame()
+            pipeline.submit(copy_frame_bgr(frame, pipeline.acquire()))
+            
+            if i % max(1, total_frames // 10) == 0:
+                pct = (i / total_frames) * 100
+                print(f"📊 Progression: {pct:.0f}%")
+    
+    add_soundtrack(output_filename, total_frames / CFG.FPS, game.events, CFG.FPS)
+    
+    try:
+        shutil.rmtree(CFG.FRAMES_DIR)
+    except Exception:
+        pass
+    
+    print(f"✅ Vidéo créée : {output_filename}")
+    print("🚀 Prêt pour TikTok / Shorts / Reels.")
+    return output_filename
+
+def plan_segments(seed, total_frames, segments):
+    """Simule le match sans rendu et renvoie le point de reprise de chaque segment.
+
+    Pendant un tremblement, le décalage laisse une bande de l'écran non redessinée
+    qui garde la frame précédente : un segment reprend donc à la dernière frame
+    sans tremblement et rend ces frames d'amorce sans les encoder.
+    Renvoie ([(frame de reprise, début, fin, snapshot)], événements sonores).
+    """
+    game = Game(CFG, seed)
+    bounds = [total_frames * k // segments for k in range(segments + 1)]
+    ends = dict(zip(bounds[:-1], bounds[1:]))
+    plan = []
+    resume = None
+    for i in range(total_frames):
+        game.update()
+        # La frame 0 est rendue sur un écran neuf, comme dans un processus de rendu
+        if i == 0 or not (CFG.SHAKE and (game.shake_offset[0] or game.shake_offset[1])):
+            resume = (i, game.snapshot())
+        if i in ends:
+            plan.append((resume[0], i, ends[i], resume[1]))
+    return plan, game.events
+
+def _render_segment(job):
+    """Processus de rendu : reprend le match au snapshot et encode les frames [début, fin)."""
+    CFG.__dict__.update(job['cfg'])
+    install_duel_assets(job['assets'])
+    game = Game(CFG, job['seed'])
+    game.restore(job['snapshot'])
+    with open_video_writer(job['path'], CFG.FPS, (CFG.WIDTH, CFG.HEIGHT)) as out, \
+            FramePipeline(out.write, (CFG.HEIGHT, CFG.WIDTH, 3)) as pipeline:
+        for i in range(job['resume'], job['end']):
+            if i > job['resume']:
+                game.update()
+            frame = game.render_frame()
+            if i >= job['start']:
+                pipeline.submit(copy_frame_bgr(frame, pipeline.acquire()))
+    return job['path']
+
+def concat_videos(paths, output):
+    """Assemble des segments de même format sans réencodage (démultiplexeur concat de ffmpeg)."""
+    listing = Path(output).with_suffix('.txt')
+    listing.write_text(''.join(f"file '{Path(p).resolve()}'\n" for p in paths), encoding='utf-8')
+    try:
+        cmd = [_ffmpeg_exe(), "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", str(listing),
+               "-c", "copy", "-movflags", "+faststart", str(output)]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    finally:
+        listing.unlink(missing_ok=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"concaténation ffmpeg impossible : {result.stderr.strip()[-300:]}")
+
+def render_video_parallel(seed=None, workers=None, output=None):
+    """Rendu du duel en segments parallèles, identique image par image au rendu en série."""
+    workers = workers or CFG.RENDER_WORKERS
+    total_frames = int(CFG.DURATION * CFG.FPS)
+    seed = choose_seed(seed, total_frames)
+    plan, events = plan_segments(seed, total_frames, max(1, min(workers, total_frames)))
+    output_filename = output or CFG.OUTPUT_FILE
+    stem = Path(output_filename).with_suffix('')
+    assets = export_duel_assets()
+    jobs = [{'cfg': dict(vars(CFG)), 'assets': assets, 'seed': seed, 'snapshot': snap,
+             'resume': resume, 'start': start, 'end': end, 'path': f"{stem}.part{k:03d}.mp4"}
+            for k, (resume, start, end, snap) in enumerate(plan)]
+    print(f"🎮 Génération en cours ({len(jobs)} segments sur {workers} processus)...")
+    # "spawn" : processus neufs, sans hériter de l'état pygame/SDL du parent
+    ctx = multiprocessing.get_context("spawn")
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            futures = [pool.submit(_render_segment, job) for job in jobs]
+            for done, future in enumerate(as_completed(futures), 1):
+                future.result()
+                print(f"📊 Progression: {done}/{len(jobs)} segments")
+        concat_videos([job['path'] for job in jobs], output_filename)
+    finally:
+        for job in jobs:
+            Path(job['path']).unlink(missing_ok=True)
+    add_soundtrack(output_filename, total_frames / CFG.FPS, events, CFG.FPS)
+    print(f"✅ Vidéo créée : {output_filename}")
+    print("🚀 Prêt pour TikTok / Shorts / Reels.")
+    return output_filename
+
+def blend_images(img_path1, img_path2, out_path, person1=None, person2=None):
+    from PIL import Image, ImageDraw
+    
+    # Fonction pour créer un avatar de fallback
+    def create_fallback_avatar(name, color):
+        im = Image.new('RGBA', (400, 400), color)
+        d = ImageDraw.Draw(im)
+        # Dessiner un cercle pour la tête
+        d.ellipse([50, 50, 350, 350], fill=(255, 255, 255, 100))
+        # Ajouter la première lettre du nom
+        try:
+            # Essayer d'utiliser une police plus grande
+            font_size = 120
+            d.text((200, 180), name[0].upper(), fill=(255, 255, 255, 255), anchor="mm")
+        except:
+            # Fallback si la police échoue
+            d.text((150, 150), name[0].upper(), fill=(255, 255, 255, 255))
+        return im
+    
+    # Charger ou créer les images
+    try:
+        im1 = Image.fromarray(portrait_array(person1, img_path1))
+    except:
+        # Créer un avatar de fallback pour l'homme
+        color1 = (random.randint(100, 200), random.randint(50, 150), random.randint(50, 150), 255)
+        im1 = create_fallback_avatar("H", color1)
+    
+    try:
+        im2 = Image.fromarray(portrait_array(person2, img_path2))
+    except:
+        # Créer un avatar de fallback pour la femme
+        color2 = (random.randint(150, 255), random.randint(100, 200), random.randint(150, 255), 255)
+        im2 = create_fallback_avatar("F", color2)
+    
+    # Fusionner les images
+    blended = Image.blend(im1, im2, alpha=0.5)
+    blended.save(out_path)
+    return blended
+
+def pick_couples(count, given=(), rng=random):
+    """`count` couples (homme, femme) distincts : ceux de `given` d'abord, puis tirés dans `rng`."""
+    couples = list(given)[:count]
+    used = set(couples)
+    while len(couples) < count:
+        h = pick_name(HOMMES, rng)
+        f = pick_name(FEMMES, rng)
+        if (h, f) in used:
+            continue
+        used.add((h, f))
+        couples.append((h, f))
+    return couples
+
+def fusion_children_mode(couples=None, output=None):
+    couples = pick_couples(10, couples or ())
+    children_paths = []
+    for idx, (n1, n2) in enumerate(couples, 1):
+        print(f"\n👩‍❤️‍👨 Couple {idx}: {n1} + {n2}")
+        img1, img2 = f"parent1_{idx}.png", f"parent2_{idx}.png"
+        ok1, ok2 = acquire_portraits([(n1, img1), (n2, img2)])
+        if not ok1:
+            from PIL import Image, ImageDraw
+            im = Image.new('RGBA', (400,400), (random.randint(100,255),random.randint(100,255),random.randint(100,255),255))
+            d = ImageDraw.Draw(im)
+            d.text((100,180), n1[0], fill=(255,255,255,255))
+            im.save(img1)
+        if not ok2:
+            from PIL import Image, ImageDraw
+            im = Image.new('RGBA', (400,400), (random.randint(100,255),random.randint(100,255),random.randint(100,255),255))
+            d = ImageDraw.Draw(im)
+            d.text((100,180), n2[0], fill=(255,255,255,255))
+            im.save(img2)
+        child_path = f"child_{idx}.png"
+        blend_images(img1, img2, child_path, n1 if ok1 else None, n2 if ok2 else None)
+        children_paths.append((child_path, n1, n2))
+    # Affichage et choix du plus beau
+    from PIL import Image
+    import matplotlib.pyplot as plt
+    fig, axs = plt.subplots(2, 5, figsize=(20,8))
+    for i, (child_path, n1, n2) in enumerate(children_paths):
+        ax = axs[i//5, i%5]
+        ax.imshow(Image.open(child_path))
+        ax.set_title(f"{n1} + {n2}")
+        ax.axis('off')
+    winner = random.choice(children_paths)
+    plt.suptitle(f"L'enfant le plus beau : {winner[1]} + {winner[2]} !", fontsize=24, color='gold')
+    plt.tight_layout()
+    if output is None:
+        plt.show()
+        return None
+    fig.savefig(output)
+    plt.close(fig)
+    print(f"✅ Grille des enfants enregistrée : {output}")
+    return output
+
+# =========================
+# Compositing du cartoon (alpha pré-multiplié en entiers)
+# =========================
+def div255(t, scratch=None):
+    """Division arrondie par 255, en place, d'un tableau uint16 (valeurs <= 255*255).
+
+    (t + 128 + ((t + 128) >> 8)) >> 8 est exact sur cette plage, sans flottants.
+    """
+    t += 128
+    t += np.right_shift(t, 8, out=scratch)
+    t >>= 8
+    return t
+
+class PremultipliedSprite:
+    """Image RGBA préparée une fois pour `composite`.
+
+    Couleurs pré-multipliées par l'alpha (uint8) et opacité complémentaire
+    255 - alpha (uint16) : poser le sprite se réduit à `dst * inverse / 255 + couleur`
+    en entiers. Une image sans transparence est simplement copiée.
+    """
+    def __init__(self, image):
+        image = np.asarray(image, dtype=np.uint8)
+        self.h, self.w = image.shape[:2]
+        if image.shape[2] == 4 and (image[..., 3] < 255).any():
+            alpha = image[..., 3:4].astype(np.uint16)
+            self.color = div255(image[..., :3] * alpha).astype(np.uint8)
+            self.inverse = 255 - alpha
+            # Tampons de calcul réutilisés à chaque pose
+            self.work = np.empty((self.h, self.w, 3), dtype=np.uint16)
+            self.shift = np.empty_like(self.work)
+        else:
+            self.color = np.ascontiguousarray(image[..., :3])
+            self.inverse = None
+
+def composite(frame, sprite, x, y):
+    """Pose `sprite` (PremultipliedSprite) dans `frame` avec son coin en (x, y), en place.
+
+    Le sprite est rogné aux bords de la frame au lieu d'être ignoré.
+    """
+    fh, fw = frame.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + sprite.w, fw), min(y + sprite.h, fh)
+    if x0 >= x1 or y0 >= y1:
+        return frame
+    dst = frame[y0:y1, x0:x1]
+    src = (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
+    if sprite.inverse is None:
+        dst[...] = sprite.color[src]
+        return frame
+    work = sprite.work[src]
+    np.multiply(dst, sprite.inverse[src], out=work)
+    div255(work, sprite.shift[src])
+    work += sprite.color[src]
+    np.copyto(dst, work, casting='unsafe')
+    return frame
+
+def prepare_cartoon_couple(idx, n1, n2):
+    """Portraits des parents (téléchargés ou avatars) et bébé fusionné d'un couple du cartoon.
+
+    Renvoie (avatar1, avatar2, bébé) en RGBA 400x400 et le chemin du PNG du bébé.
+    """
+    print(f"\n🎬 Cartoon couple {idx}: {n1} + {n2}")
+    img1, img2 = f"parent1_{idx}.png", f"parent2_{idx}.png"
+    
+    # Télécharger ou créer des avatars réalistes
+    print(f"  📥 Téléchargement des images pour {n1} et {n2}...")
+    
+    ok1, ok2 = acquire_portraits([(n1, img1), (n2, img2)])
+    missing = [(n, path, is_male) for n, path, is_male, ok in
+               ((n1, img1, True, ok1), (n2, img2, False, ok2)) if not ok]
+    if missing:
+        print(f"  🎨 Création d'avatars réalistes pour {', '.join(n for n, _, _ in missing)}...")
+        create_realistic_avatars(missing)
+    
+    # Génère le bébé fusionné
+    child_path = f"child_{idx}.png"
+    blend_images(img1, img2, child_path, n1, n2)
+    
+    try:
+        # Charger l'avatar 1 (pack hors-ligne ou PNG)
+        avatar1 = portrait_array(n1, img1)
+        print(f"  ✅ Avatar 1 chargé: {avatar1.shape}")
     except Exception as e:
-        print(f"    ❌ Erreur dans download_image_robust: {e}")
-        return False
+        print(f"  ⚠️  Erreur lors du chargement de {img1}: {e}")
+        # Créer un avatar de fallback pour l'homme
+        avatar1 = np.zeros((400, 400, 4), dtype=np.uint8)
+        color1 = (random.randint(100, 200), random.randint(50, 150), random.randint(50, 150), 255)
+        cv2.circle(avatar1, (200, 200), 150, color1, -1)
+        cv2.putText(avatar1, n1[0].upper(), (150, 220), cv2.FONT_HERSHEY_SIMPLEX, 3, (255, 255, 255, 255), 5)
+    
+    try:
+        # Charger l'avatar 2 (pack hors-ligne ou PNG)
+        avatar2 = portrait_array(n2, img2)
+        print(f"  ✅ Avatar 2 chargé: {avatar2.shape}")
+    except Exception as e:
+        print(f"  ⚠️  Erreur lors du chargement de {img2}: {e}")
+        # Créer un avatar de fallback pour la femme
+        avatar2 = np.zeros((400, 400, 4), dtype=np.uint8)
+        color2 = (random.randint(150, 255), random.randint(100, 200), random.randint(150, 255), 255)
+        cv2.circle(avatar2, (200, 200), 150, color2, -1)
+        cv2.putText(avatar2, n2[0].upper(), (150, 220), cv2.FONT_HERSHEY_SIMPLEX, 3, (255, 255, 255, 255), 5)
+    
+    try:
+        # Charger le bébé
+        pil_baby = Image.open(child_path).convert('RGBA')
+        pil_baby = pil_baby.resize((400, 400), Image.Resampling.LANCZOS)
+        baby = np.array(pil_baby)
+        print(f"  ✅ Bébé chargé: {baby.shape}")
+    except Exception as e:
+        print(f"  ⚠️  Erreur lors du chargement de {child_path}: {e}")
+        # Créer un bébé de fallback
+        baby = np.zeros((400, 400, 4), dtype=np.uint8)
+        color_baby = (random.randint(150, 255), random.randint(150, 255), random.randint(150, 255), 255)
+        cv2.circle(baby, (200, 200), 150, color_baby, -1)
+        cv2.putText(baby, "B", (150, 220), cv2.FONT_HERSHEY_SIMPLEX, 3, (255, 255, 255, 255), 5)
+    return avatar1, avatar2, baby, child_path
+
+# Phases du cartoon : fonctions pures de (frame, acteurs, temps local, rng) qui dessinent dans `frame`.
+# Le temps local d'un couple part du début de sa séquence.
+def phase_entry(frame, cast, t, rng):
+    """Entrée rapide : les parents arrivent des deux bords."""
+    WIDTH, HEIGHT, FPS = CFG.WIDTH, CFG.HEIGHT, CFG.CARTOON_FPS
+    avatar1, avatar2, _ = cast.sprites
+    x1 = int(-200 + (WIDTH//2-120+30)*(t/(FPS*0.7)))
+    x2 = int(WIDTH+200 - (WIDTH//2-120+30)*(t/(FPS*0.7)))
+    composite(frame, avatar1, x1, HEIGHT//2-100)
+    composite(frame, avatar2, x2, HEIGHT//2-100)
+
+def phase_chase(frame, cast, t, rng):
+    """Poursuite : les parents oscillent face à face."""
+    WIDTH, HEIGHT = CFG.WIDTH, CFG.HEIGHT
+    avatar1, avatar2, _ = cast.sprites
+    composite(frame, avatar1, int(WIDTH//2-220 + 60*math.sin(t/8)), HEIGHT//2-100)
+    composite(frame, avatar2, int(WIDTH//2+20 - 60*math.sin(t/8)), HEIGHT//2-100)
+
+def phase_boing(frame, cast, t, rng):
+    """Collision des parents (plan fixe)."""
+    WIDTH, HEIGHT = CFG.WIDTH, CFG.HEIGHT
+    avatar1, avatar2, _ = cast.sprites
+    composite(frame, avatar1, WIDTH//2-200, HEIGHT//2-100)
+    composite(frame, avatar2, WIDTH//2-120, HEIGHT//2-100)
+    cv2.putText(frame, "BOING!", (WIDTH//2-100, HEIGHT//2-120), cv2.FONT_HERSHEY_TRIPLEX, 2, (255,255,0), 6)
+
+def phase_pouf(frame, cast, t, rng):
+    """Explosion de paillettes et nuage, tirés du rng de la frame."""
+    WIDTH, HEIGHT = CFG.WIDTH, CFG.HEIGHT
+    xs = rng.integers(WIDTH//2-80, WIDTH//2+81, 80)
+    ys = rng.integers(HEIGHT//2-40, HEIGHT//2+121, 80)
+    radii = rng.integers(8, 19, 80)
+    colors = rng.integers(150, 255, (80, 3))
+    for px, py, r, color in zip(xs.tolist(), ys.tolist(), radii.tolist(), colors.tolist()):
+        cv2.circle(frame, (px, py), r, tuple(color), -1)
+    cv2.ellipse(frame, (WIDTH//2, HEIGHT//2+100), (120,60), 0, 0, 360, (255,255,255), -1)
+    cv2.putText(frame, "POUF!", (WIDTH//2-80, HEIGHT//2-60), cv2.FONT_HERSHEY_TRIPLEX, 2, (255,0,255), 6)
+
+def phase_emerge(frame, cast, t, rng):
+    """Le bébé sort du nuage."""
+    WIDTH, HEIGHT, FPS = CFG.WIDTH, CFG.HEIGHT, CFG.CARTOON_FPS
+    alpha = min(1, (t-FPS*2.5)/(FPS*1.5))
+    composite(frame, cast.sprites[2], WIDTH//2-200, HEIGHT//2-40 + int(80*(1-alpha)))
+    cv2.ellipse(frame, (WIDTH//2, HEIGHT//2+100), (120,60), 0, 0, 360, (255,255,255), -1)
+    if alpha>0.7:
+        cv2.putText(frame, "TCHAK!", (WIDTH//2-100, HEIGHT//2-120), cv2.FONT_HERSHEY_TRIPLEX, 2, (0,255,255), 6)
+
+def phase_pause(frame, cast, t, rng):
+    """Pause sur le bébé et les noms des parents (plan fixe, aussi utilisé pour le défilé)."""
+    WIDTH, HEIGHT = CFG.WIDTH, CFG.HEIGHT
+    composite(frame, cast.sprites[2], WIDTH//2-200, HEIGHT//2-40)
+    cv2.putText(frame, f"{cast.n1} + {cast.n2}", (WIDTH//2-180, HEIGHT-120), cv2.FONT_HERSHEY_TRIPLEX, 1.2, (255,255,255), 3)
+
+def phase_winner(frame, cast, t, rng):
+    """Annonce du plus beau bébé (plan fixe)."""
+    WIDTH, HEIGHT = CFG.WIDTH, CFG.HEIGHT
+    composite(frame, cast.sprites[2], WIDTH//2-200, HEIGHT//2-40)
+    cv2.putText(frame, f"Le plus beau : {cast.n1} + {cast.n2} !", (WIDTH//2-260, HEIGHT//2+220), cv2.FONT_HERSHEY_TRIPLEX, 1.3, (255,215,0), 4)
+
+# Séquence d'un couple : (phase, fin en secondes depuis le début du couple, plan fixe)
+CARTOON_PHASES = (
+    (phase_entry, 0.7, False),
+    (phase_chase, 1.5, False),
+    (phase_boing, 2, True),
+    (phase_pouf, 2.5, False),
+    (phase_emerge, 4, False),
+    (phase_pause, None, True),  # jusqu'à la fin de la séquence
+)
+
+class CartoonCast:
+    """Acteurs d'un couple : portraits et bébé préparés au premier besoin, puis gardés."""
+    def __init__(self, idx, n1, n2):
+        self.idx, self.n1, self.n2 = idx, n1, n2
+        self._sprites = None
+
+    @property
+    def sprites(self):
+        """(avatar 1, avatar 2, bébé) en PremultipliedSprite."""
+        if self._sprites is None:
+            avatar1, avatar2, baby, _ = prepare_cartoon_couple(self.idx, self.n1, self.n2)
+            self._sprites = tuple(PremultipliedSprite(img) for img in (avatar1, avatar2, baby))
+        return self._sprites
+
+def cartoon_couple_events(base):
+    """Bruitages calés sur les phases d'un couple dont la première frame est `base`."""
+    FPS = CFG.CARTOON_FPS
+    return [(base + math.ceil(FPS*1.5), "boing"), (base + math.ceil(FPS*2), "pouf"),
+            (base + int(FPS*2.5 + 0.7*FPS*1.5) + 1, "tchak")]
+
+class CartoonTimeline:
+    """Montage du cartoon en accès direct : toute frame se calcule à partir de son seul numéro.
+
+    Le montage est une liste triée de segments [début, fin) associant une phase à un
+    couple. La frame i est rendue par la phase de son segment, au temps local du
+    couple, avec un rng tiré de (seed, i) : rendre la frame 812 ne rejoue pas les
+    précédentes. Seuls les acteurs du couple concerné sont préparés.
+    """
+    def __init__(self, couples, winner=None, seed=None):
+        FPS = CFG.CARTOON_FPS
+        self.couples = list(couples)
+        self.casts = [CartoonCast(idx, n1, n2) for idx, (n1, n2) in enumerate(self.couples, 1)]
+        self.winner = random.randrange(len(self.casts)) if winner is None else winner
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.segments = []  # (début, fin, phase, acteurs, origine du temps local, plan fixe)
+        self.events = []
+        per_couple = int(FPS * (CFG.CARTOON_DURATION/5))
+        start = 0
+        for cast in self.casts:
+            self.events += cartoon_couple_events(start)
+            local = 0
+            for phase, end, still in CARTOON_PHASES:
+                stop = per_couple if end is None else min(per_couple, max(local, math.ceil(FPS*end)))
+                self._add(start + local, start + stop, phase, cast, start, still)
+                local = stop
+            start += per_couple
+        # Défilé des bébés puis annonce du gagnant
+        for cast in self.casts:
+            start = self._add(start, start + int(FPS*2), phase_pause, cast, start, True)
+        self.events.append((start, "win"))
+        self.length = self._add(start, start + int(FPS*3), phase_winner, self.casts[self.winner], start, True)
+        self.starts = [segment[0] for segment in self.segments]
+
+    def _add(self, start, end, phase, cast, origin, still):
+        if end > start:
+            self.segments.append((start, end, phase, cast, origin, still))
+        return end
+
+    def __len__(self):
+        return self.length
+
+    def segment(self, index):
+        if not 0 <= index < self.length:
+            raise IndexError(f"frame {index} hors du cartoon (0-{self.length - 1})")
+        return self.segments[bisect.bisect_right(self.starts, index) - 1]
+
+    def render(self, index, frame=None):
+        """Frame `index` (BGR, h x w x 3), dessinée dans `frame` s'il est fourni."""
+        _, _, phase, cast, origin, _ = self.segment(index)
+        if frame is None:
+            frame = np.zeros((CFG.HEIGHT, CFG.WIDTH, 3), dtype=np.uint8)
+        else:
+            frame.fill(0)
+        phase(frame, cast, index - origin, np.random.default_rng([self.seed, index]))
+        return frame
+
+    def frames(self, start=0, end=None):
+        """Frames [start, end) dans l'ordre ; un plan fixe renvoie le même tableau (voir `frame_runs`)."""
+        end = self.length if end is None else min(end, self.length)
+        index = start
+        while index < end:
+            segment = self.segment(index)
+            stop = min(segment[1], end)
+            if segment[5]:
+                frame = self.render(index)
+                for _ in range(index, stop):
+                    yield frame
+            else:
+                for i in range(index, stop):
+                    yield self.render(i)
+            index = stop
+
+    def describe(self):
+        """Tout ce qu'il faut pour reconstruire ce montage à l'identique (voir `load_timeline`)."""
+        return {'couples': [list(couple) for couple in self.couples], 'winner': self.winner,
+                'seed': self.seed, 'fps': CFG.CARTOON_FPS, 'duration': CFG.CARTOON_DURATION,
+                'frames': self.length}
+
+    def spans(self, cast_index):
+        """Plages [début, fin) fusionnées des segments qui montrent le couple `cast_index`."""
+        cast = self.casts[cast_index]
+        spans = []
+        for start, end, _, owner, _, _ in self.segments:
+            if owner is not cast:
+                continue
+            if spans and spans[-1][1] == start:
+                spans[-1] = (spans[-1][0], end)
+            else:
+                spans.append((start, end))
+        return spans
+
+def encode_cartoon_frames(frames, path):
+    """Encode un flux de frames du cartoon dans `path` et renvoie son nombre de frames."""
+    WIDTH, HEIGHT, FPS = CFG.WIDTH, CFG.HEIGHT, CFG.CARTOON_FPS
+    # Frames encodées au fil de leur composition : quelques frames en mémoire au plus,
+    # et un plan fixe ne traverse le pipeline qu'une fois
+    total = 0
+    with open_video_writer(path, FPS, (WIDTH, HEIGHT), hold=CFG.VIDEO_HOLD) as out, \
+            FramePipeline(out.write, (HEIGHT, WIDTH, 3), hold=out.hold) as pipeline:
+        for frame, count in frame_runs(frames):
+            buffer = pipeline.acquire()
+            np.copyto(buffer, frame)
+            pipeline.submit(buffer, count)
+            total += count
+    return total
+
+def timeline_path(video_path):
+    """Fichier compagnon `<vidéo>.timeline.json` décrivant le montage d'une vidéo cartoon."""
+    return Path(video_path).with_suffix('.timeline.json')
+
+def save_timeline(timeline, video_path):
+    """Écrit le montage à côté de la vidéo et rappelle de quoi le reproduire."""
+    path = timeline_path(video_path)
+    path.write_text(json.dumps(timeline.describe(), ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"🧭 Montage : graine {timeline.seed}, gagnant {timeline.winner + 1}, "
+          f"{len(timeline)} frames -> {path}")
+    return path
+
+def load_timeline(path):
+    """Reconstruit le montage décrit par `path` (cadence et durée du cartoon comprises)."""
+    spec = json.loads(Path(path).read_text(encoding='utf-8'))
+    CFG.CARTOON_FPS = spec.get('fps', CFG.CARTOON_FPS)
+    CFG.CARTOON_DURATION = spec.get('duration', CFG.CARTOON_DURATION)
+    return CartoonTimeline([tuple(couple) for couple in spec['couples']], spec['winner'], spec['seed'])
+
+def cartoon_preview(index, couples=None, output=None, seed=None, winner=None, timeline=None):
+    """Enregistre la seule frame `index` du cartoon en PNG, sans rendre la vidéo.
+
+    Pour retrouver la frame d'une vidéo déjà rendue, passer son `timeline`
+    (fichier .timeline.json) ou les mêmes couples, graine et gagnant.
+    """
+    if timeline is not None:
+        timeline = load_timeline(timeline)
+    else:
+        timeline = CartoonTimeline(pick_couples(5, couples or ()), winner, seed)
+    output = output or f"preview_{index}.png"
+    cv2.imwrite(str(output), timeline.render(index))
+    print(f"🖼️  Aperçu de la frame {index}/{len(timeline)} : {output}")
+    return output
+
+def cartoon_fusion_video(couples=None, output=None, workers=None, seed=None, winner=None):
+    workers = workers or CFG.RENDER_WORKERS
+    timeline = CartoonTimeline(pick_couples(5, couples or ()), winner, seed)
+    if workers > 1:
+        if _ffmpeg_exe() is not None:
+            return cartoon_fusion_video_parallel(timeline, output, workers)
+        print("⚠️  ffmpeg introuvable (concaténation impossible) : rendu en série")
+    cartoon_filename = output or generate_viral_filename()
+    save_timeline(timeline, cartoon_filename)
+    # Les acteurs de chaque couple sont préparés à sa première frame : l'encodage démarre tôt
+    total = encode_cartoon_frames(timeline.frames(), cartoon_filename)
+    add_soundtrack(cartoon_filename, total / CFG.CARTOON_FPS, timeline.events, CFG.CARTOON_FPS)
+    print(f"✅ Vidéo cartoon Looney Tunes générée : {cartoon_filename}")
+    return cartoon_filename
+
+def _render_cartoon_clips(job):
+    """Processus du cartoon : rend des plages du montage, chacune dans son propre clip.
+
+    Renvoie [(chemin, frames)].
+    """
+    global PORTRAIT_CACHE, PORTRAIT_PACK
+    CFG.__dict__.update(job['cfg'])
+    PORTRAIT_CACHE = PortraitCache(CFG.CACHE_DIR, CFG.CACHE_MAX_BYTES)
+    PORTRAIT_PACK = PortraitPack(CFG.PACK_PATH)
+    # Hasard des portraits de secours ; celui des frames vient de la graine du montage
+    random.seed(job['seed'])
+    np.random.seed(job['seed'] % 2**32)
+    timeline = CartoonTimeline(job['couples'], job['winner'], job['timeline_seed'])
+    return [(path, encode_cartoon_frames(timeline.frames(start, end), path))
+            for path, start, end in job['clips']]
+
+def cartoon_fusion_video_parallel(timeline, output=None, workers=None):
+    """Cartoon rendu par couple dans des processus séparés, clips assemblés sans réencodage.
+
+    Le montage étant en accès direct, chaque processus rend les plages de son couple
+    (sa séquence, son passage au défilé et, s'il gagne, l'annonce) à l'identique du
+    rendu en série. Les clips sont ensuite mis bout à bout dans l'ordre du montage.
+    """
+    workers = workers or CFG.RENDER_WORKERS
+    FPS = CFG.CARTOON_FPS
+    cartoon_filename = output or generate_viral_filename()
+    stem = Path(cartoon_filename).with_suffix('')
+    save_timeline(timeline, cartoon_filename)
+    if not CFG.OFFLINE:
+        warm_portraits([name for couple in timeline.couples for name in couple])
+    # Portraits lus dans le cache préchauffé ; les cœurs sont partagés entre les encodeurs
+    cfg = dict(vars(CFG), OFFLINE=True, VIDEO_THREADS=max(1, (os.cpu_count() or 1) // workers))
+    jobs = [{'cfg': cfg, 'couples': timeline.couples, 'winner': timeline.winner,
+             'timeline_seed': timeline.seed, 'seed': random.getrandbits(32),
+             'clips': [(f"{stem}.part{start:06d}.mp4", start, end) for start, end in timeline.spans(k)]}
+            for k in range(len(timeline.casts))]
+    clips = sorted(clip for job in jobs for clip in job['clips'])
+    print(f"🎬 Cartoon en cours ({len(jobs)} couples sur {workers} processus)...")
+    ctx = multiprocessing.get_context("spawn")
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            futures = [pool.submit(_render_cartoon_clips, job) for job in jobs]
+            for done, future in enumerate(as_completed(futures), 1):
+                future.result()
+                print(f"📊 Progression: {done}/{len(jobs)} couples")
+        concat_videos([path for path, _, _ in clips], cartoon_filename)
+    finally:
+        for path, _, _ in clips:
+            Path(path).unlink(missing_ok=True)
+    add_soundtrack(cartoon_filename, len(timeline) / FPS, timeline.events, FPS)
+    print(f"✅ Vidéo cartoon Looney Tunes générée : {cartoon_filename}")
+    return cartoon_filename
+
+# =========================
+# Production en lot
+# =========================
+BATCH_MODES = {'duel': 1, 'cartoon': 5, 'children': 10}  # couples consommés par vidéo
+
+def warm_portraits(names, workers=8):
+    """Remplit le cache disque des portraits pour `names`, une seule fois pour tout le lot."""
+    names = [n for n in dict.fromkeys(names) if not PORTRAIT_PACK.has(n)]
+    if not names:
+        return
+    print(f"🔥 Préchauffage du cache : {len(names)} portraits...")
+    with tempfile.TemporaryDirectory() as tmp:
+        acquire_portraits([(n, os.path.join(tmp, f"{i}.png")) for i, n in enumerate(names)],
+                          max_workers=workers)
+
+def _run_batch_job(job):
+    """Processus du lot : une vidéo dans son propre dossier, portraits lus dans le cache partagé."""
+    global PORTRAIT_CACHE, PORTRAIT_PACK, _DUEL_ASSETS
+    CFG.__dict__.update(job['cfg'])
+    PORTRAIT_CACHE = PortraitCache(CFG.CACHE_DIR, CFG.CACHE_MAX_BYTES)
+    PORTRAIT_PACK = PortraitPack(CFG.PACK_PATH)
+    _DUEL_ASSETS = None
+    workdir = Path(job['workdir'])
+    workdir.mkdir(parents=True, exist_ok=True)
+    os.chdir(workdir)
+    random.seed(job['seed'])
+    np.random.seed(job['seed'] % 2**32)
+    record = {k: job[k] for k in ('index', 'mode', 'seed', 'couples', 'output')}
+    start = time.perf_counter()
+    try:
+        if job['mode'] == 'duel':
+            duel_assets(job['couples'][0])
+            record['match_seed'] = choose_seed(job['match_seed'], int(CFG.DURATION * CFG.FPS))
+            render_video(record['match_seed'], workers=1, output=job['output'])
+        elif job['mode'] == 'cartoon':
+            cartoon_fusion_video(job['couples'], job['output'])
+        else:
+            fusion_children_mode(job['couples'], job['output'])
+        record['status'] = 'ok'
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = f"{type(e).__name__}: {e}"
+    record['seconds'] = round(time.perf_counter() - start, 2)
+    os.chdir(job['cwd'])
+    shutil.rmtree(workdir, ignore_errors=True)
+    return record
+
+def run_batch(mode, count, seeds=(), pairs=(), workers=None, out_dir=Path("batch_out")):
+    """Produit `count` vidéos en parallèle et écrit `manifest.json` dans `out_dir`.
+
+    Les couples de chaque vidéo sont tirés d'avance (ceux de `pairs` d'abord) pour
+    préchauffer le cache une fois ; les processus le lisent ensuite hors-ligne.
+    """
+    workers = workers or os.cpu_count() or 1
+    count = max(count, len(seeds))
+    out_dir = Path(out_dir).resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    pairs = list(pairs)
+    per_job = BATCH_MODES[mode]
+    # Chemins absolus : chaque processus travaille dans son propre dossier
+    cfg = dict(vars(CFG), CACHE_DIR=CFG.CACHE_DIR.resolve(), PACK_PATH=CFG.PACK_PATH.resolve(),
+               FONT_CACHE=CFG.FONT_CACHE.resolve(), OFFLINE=True, RENDER_WORKERS=1,
+               VIDEO_THREADS=max(1, (os.cpu_count() or 1) // workers))
+    # Graines manquantes tirées indépendamment ; chaque job a ensuite son propre générateur,
+    # sans toucher au `random` global de l'appelant
+    draws = random.Random()
+    job_seeds = list(seeds) + [draws.getrandbits(32) for _ in range(count - len(seeds))]
+    jobs = []
+    for k, seed in enumerate(job_seeds):
+        rng = random.Random(seed)
+        couples = pick_couples(per_job, pairs[k * per_job:(k + 1) * per_job], rng)
+        suffix = '.png' if mode == 'children' else '.mp4'
+        jobs.append({
+            'index': k, 'mode': mode, 'seed': seed, 'couples': couples, 'cfg': cfg,
+            'match_seed': seeds[k] if k < len(seeds) else None,
+            'output': str(out_dir / f"{k:03d}_{Path(generate_viral_filename(rng)).stem}{suffix}"),
+            'workdir': str(out_dir / f".work_{k:03d}"), 'cwd': os.getcwd(),
+        })
+    if not CFG.OFFLINE:
+        warm_portraits([name for job in jobs for couple in job['couples'] for name in couple])
+    print(f"🏭 Lot de {count} vidéos ({mode}) sur {workers} processus...")
+    start = time.perf_counter()
+    records = []
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        for future in as_completed([pool.submit(_run_batch_job, job) for job in jobs]):
+            record = future.result()
+            records.append(record)
+            mark = "✅" if record['status'] == 'ok' else "❌"
+            print(f"{mark} [{len(records)}/{count}] {record['output']} ({record['seconds']}s)")
+    elapsed = time.perf_counter() - start
+    done = sum(r['status'] == 'ok' for r in records)
+    per_hour = done * 3600 / elapsed if elapsed else 0.0
+    manifest = {'mode': mode, 'count': count, 'workers': workers, 'succeeded': done,
+                'elapsed_seconds': round(elapsed, 2), 'videos_per_hour': round(per_hour, 1),
+                'jobs': sorted(records, key=lambda r: r['index'])}
+    manifest_path = out_dir / "manifest.json"
+    manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"📈 {done}/{count} vidéos en {elapsed:.1f}s — {per_hour:.1f} vidéos/heure")
+    print(f"🗂️  Manifeste : {manifest_path}")
+    return manifest
+
+def parse_pair(text):
+    """`"Homme+Femme"` -> ("Homme", "Femme")."""
+    h, sep, f = text.partition('+')
+    if not sep or not h.strip() or not f.strip():
+        raise argparse.ArgumentTypeError(f"couple attendu sous la forme 'Homme+Femme' : {text!r}")
+    return h.strip(), f.strip()
+
+# =========================
+# Ligne de commande
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Générateur de vidéos TikTok / Shorts / Reels.")
+    sub = parser.add_subparsers(dest="command")
+    prefetch = sub.add_parser("prefetch", help="pré-télécharge tous les portraits dans un pack hors-ligne")
+    prefetch.add_argument("--output", type=Path, default=CFG.PACK_PATH, help="chemin du pack (.npy)")
+    prefetch.add_argument("--workers", type=int, default=8, help="portraits acquis en parallèle")
+    duel = sub.add_parser("duel", help="génère une vidéo de duel")
+    duel.add_argument("--seed", type=int, default=None, help="graine du match (sinon recherche de la plus virale)")
+    duel.add_argument("--workers", type=int, default=None, help="processus de rendu (segments parallèles)")
+    cartoon = sub.add_parser("cartoon", help="génère une vidéo cartoon (mode par défaut)")
+    cartoon.add_argument("--pair", "--couples", type=parse_pair, action="append", default=[],
+                         help="couple 'Homme+Femme' (répétable, 5 au plus)")
+    cartoon.add_argument("--seed", type=int, default=None, help="graine du montage (paillettes)")
+    cartoon.add_argument("--winner", type=int, default=None, help="numéro du couple gagnant (1-5)")
+    cartoon.add_argument("--timeline", type=Path, default=None,
+                         help="montage d'une vidéo rendue (.timeline.json), pour --preview")
+    cartoon.add_argument("--workers", type=int, default=None, help="processus de rendu (un couple chacun)")
+    cartoon.add_argument("--preview", type=int, default=None, metavar="FRAME",
+                         help="enregistre seulement cette frame en PNG (accès direct, sans rendu vidéo)")
+    batch = sub.add_parser("batch", help="produit plusieurs vidéos en parallèle")
+    batch.add_argument("mode", choices=sorted(BATCH_MODES), help="type de vidéo")
+    batch.add_argument("--count", type=int, default=1, help="nombre de vidéos")
+    batch.add_argument("--seeds", type=int, nargs="+", default=[], help="graine de chaque vidéo, dans l'ordre")
+    batch.add_argument("--pair", type=parse_pair, action="append", default=[],
+                       help="couple 'Homme+Femme' (répétable), consommés dans l'ordre des vidéos")
+    batch.add_argument("--workers", type=int, default=None, help="processus (défaut : nombre de cœurs)")
+    batch.add_argument("--out-dir", type=Path, default=Path("batch_out"), help="dossier des vidéos et du manifeste")
+    args = parser.parse_args(argv)
+
+    if args.command == "prefetch":
+        build_portrait_pack(path=args.output, workers=args.workers)
+    elif args.command == "duel":
+        render_video(args.seed, args.workers)
+    elif args.command == "cartoon":
+        winner = None if args.winner is None else args.winner - 1
+        if args.preview is not None:
+            cartoon_preview(args.preview, args.pair, seed=args.seed, winner=winner, timeline=args.timeline)
+        else:
+            cartoon_fusion_video(args.pair, workers=args.workers, seed=args.seed, winner=winner)
+    elif args.command == "batch":
+        run_batch(args.mode, args.count, args.seeds, args.pair, args.workers, args.out_dir)
+    else:
+        # --- Mode par défaut : vidéo cartoon (render_video() pour le duel) ---
+        cartoon_fusion_video()
+    if _PYGAME_READY:
+        pygame.quit()
 
-def download_unsplash_image(query, filename):
-    """Télécharge une image portrait depuis Unsplash (requête simple, pas besoin de clé)."""
-    try:
-        print(f"    🔍 Recherche Unsplash: {query}")
-        
-        # Utiliser la nouvelle approche robuste
-        if download_image_robust(query, filename):
-            return True
-        
-        # Si la recherche robuste échoue, essayer l'ancienne méthode
-        url = f"https://source.unsplash.com/400x400/?{requests.utils.quote(query + ',portrait,face')}"
-        print(f"    📥 Téléchargement depuis: {url}")
-        
-        # Ajouter des headers pour simuler un navigateur
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, timeout=10, headers=headers)
-        
-        # Vérifier si la réponse contient une image
-        if response.status_code == 200 and response.headers.get('content-type', '').startswith('image/'):
-            img_data = response.content
-            
-            # Convertir en PNG avec PIL pour s'assurer du bon format
-            from PIL import Image
-            import io
-            
-            try:
-                img = Image.open(io.BytesIO(img_data))
-                # Vérifier si c'est une image valide
-                img.verify()
-                img.close()
-                
-                # Recharger l'image pour la traiter
-                img = Image.open(io.BytesIO(img_data)).convert('RGBA')
-                img = img.resize((400, 400), Image.Resampling.LANCZOS)
-                img.save(filename, 'PNG')
-                print(f"    ✅ Image sauvegardée: {filename}")
-                return True
-            except Exception as e:
-                print(f"    ⚠️  Format d'image non reconnu: {e}")
-                return False
-        else:
-            print(f"    ⚠️  Réponse non-image reçue (status: {response.status_code}, content-type: {response.headers.get('content-type')})")
-            return False
-            
-    except Exception as e:
-        print(f"    ❌ Erreur Unsplash: {e}")
-        return False
-
-def download_pixabay_image(query, filename):
-    """Télécharge une image depuis Pixabay (sans clé API, utilisation directe)."""
-    try:
-        print(f"    🔍 Recherche Pixabay: {query}")
-        
-        # Utiliser la nouvelle approche robuste
-        if download_image_robust(query, filename):
-            return True
-        
-        # Si la recherche robuste échoue, essayer l'ancienne méthode
-        try:
-            print(f"    📥 Tentative de téléchargement depuis Pixabay...")
-            
-            # Utiliser une approche alternative - essayer de télécharger depuis Unsplash
-            # car Pixabay nécessite une clé API pour l'accès programmatique
-            unsplash_url = f"https://source.unsplash.com/400x400/?{requests.utils.quote(query + ',portrait,face')}"
-            print(f"    📥 Téléchargement depuis Unsplash (alternative Pixabay): {unsplash_url}")
-            
-            # Ajouter des headers pour simuler un navigateur
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(unsplash_url, timeout=10, headers=headers)
-            
-            # Vérifier si la réponse contient une image
-            if response.status_code == 200 and response.headers.get('content-type', '').startswith('image/'):
-                img_data = response.content
-                
-                # Convertir en PNG avec PIL pour s'assurer du bon format
-                from PIL import Image
-                import io
-                
-                try:
-                    img = Image.open(io.BytesIO(img_data))
-                    # Vérifier si c'est une image valide
-                    img.verify()
-                    img.close()
-                    
-                    # Recharger l'image pour la traiter
-                    img = Image.open(io.BytesIO(img_data)).convert('RGBA')
-                    img = img.resize((400, 400), Image.Resampling.LANCZOS)
-                    img.save(filename, 'PNG')
-                    print(f"    ✅ Image téléchargée via alternative Pixabay: {filename}")
-                    return True
-                except Exception as e:
-                    print(f"    ⚠️  Format d'image non reconnu: {e}")
-            else:
-                print(f"    ⚠️  Réponse non-image reçue (status: {response.status_code}, content-type: {response.headers.get('content-type')})")
-                
-        except Exception as e:
-            print(f"    ⚠️  Échec du téléchargement Pixabay: {e}")
-        
-        # Si le téléchargement échoue, créer un avatar de fallback plus réaliste
-        print(f"    🎨 Création d'un avatar de fallback pour Pixabay...")
-        from PIL import Image, ImageDraw, ImageFont
-        img = Image.new('RGBA', (400, 400), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        # Créer un avatar plus réaliste au lieu d'un simple cercle
-        # Couleur de peau réaliste
-        skin_colors = [
-            (255, 224, 189), (255, 205, 148), (234, 192, 134), (255, 173, 96),
-            (234, 153, 153), (255, 198, 140), (255, 218, 185), (255, 228, 196)
-        ]
-        skin_color = random.choice(skin_colors)
-        
-        # Dessiner la tête (ovale)
-        head_width, head_height = 200, 250
-        head_x = (400 - head_width) // 2
-        head_y = (400 - head_height) // 2
-        draw.ellipse([head_x, head_y, head_x + head_width, head_y + head_height], fill=skin_color + (255,))
-        
-        # Dessiner les yeux
-        eye_color = (random.randint(50, 150), random.randint(50, 150), random.randint(50, 150))
-        eye_size = 25
-        left_eye = (head_x + 60, head_y + 80)
-        right_eye = (head_x + 140, head_y + 80)
-        draw.ellipse([left_eye[0]-eye_size, left_eye[1]-eye_size, left_eye[0]+eye_size, left_eye[1]+eye_size], 
-                     fill=eye_color + (255,))
-        draw.ellipse([right_eye[0]-eye_size, right_eye[1]-eye_size, right_eye[0]+eye_size, right_eye[1]+eye_size], 
-                     fill=eye_color + (255,))
-        
-        # Pupilles
-        draw.ellipse([left_eye[0]-8, left_eye[1]-8, left_eye[0]+8, left_eye[1]+8], fill=(0, 0, 0, 255))
-        draw.ellipse([right_eye[0]-8, right_eye[1]-8, right_eye[0]+8, right_eye[1]+8], fill=(0, 0, 0, 255))
-        
-        # Nez
-        nose_color = tuple(int(c * 0.8) for c in skin_color) + (255,)
-        draw.ellipse([head_x + 85, head_y + 120, head_x + 115, head_y + 150], fill=nose_color)
-        
-        # Bouche
-        mouth_color = (220, 20, 60, 255)
-        draw.ellipse([head_x + 70, head_y + 160, head_x + 130, head_y + 180], fill=mouth_color)
-        
-        # Ajouter le nom en bas
-        try:
-            font = ImageFont.truetype("arial.ttf", 30)
-        except:
-            font = ImageFont.load_default()
-        
-        text_color = (255, 255, 255, 255)
-        text_bbox = draw.textbbox((0, 0), query.split()[0], font=font)
-        text_width = text_bbox[2] - text_bbox[0]
-        text_height = text_bbox[3] - text_bbox[1]
-        x = (400 - text_width) // 2
-        y = 350
-        draw.text((x, y), query.split()[0], fill=text_color, font=font)
-        
-        img.save(filename, 'PNG')
-        print(f"    ✅ Avatar Pixabay créé: {filename}")
-        return True
-    except Exception as e:
-        print(f"    ❌ Erreur Pixabay: {e}")
-        return False
-
-def download_pexels_image(query, filename):
-    """Télécharge une image depuis Pexels (sans clé API, création d'avatar)."""
-    try:
-        print(f"    🔍 Recherche Pexels: {query}")
-        
-        # Utiliser la nouvelle approche robuste
-        if download_image_robust(query, filename):
-            return True
-        
-        # Si la recherche robuste échoue, essayer l'ancienne méthode
-        try:
-            print(f"    📥 Tentative de téléchargement depuis Pexels...")
-            # Utiliser Unsplash comme alternative pour Pexels
-            unsplash_url = f"https://source.unsplash.com/400x400/?{requests.utils.quote(query + ',portrait,face')}"
-            print(f"    📥 Téléchargement depuis Unsplash (alternative Pexels): {unsplash_url}")
-            
-            # Ajouter des headers pour simuler un navigateur
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(unsplash_url, timeout=10, headers=headers)
-            
-            # Vérifier si la réponse contient une image
-            if response.status_code == 200 and response.headers.get('content-type', '').startswith('image/'):
-                img_data = response.content
-                
-                # Convertir en PNG avec PIL pour s'assurer du bon format
-                from PIL import Image
-                import io
-                
-                try:
-                    img = Image.open(io.BytesIO(img_data))
-                    # Vérifier si c'est une image valide
-                    img.verify()
-                    img.close()
-                    
-                    # Recharger l'image pour la traiter
-                    img = Image.open(io.BytesIO(img_data)).convert('RGBA')
-                    img = img.resize((400, 400), Image.Resampling.LANCZOS)
-                    img.save(filename, 'PNG')
-                    print(f"    ✅ Image téléchargée via alternative Pexels: {filename}")
-                    return True
-                except Exception as e:
-                    print(f"    ⚠️  Format d'image non reconnu: {e}")
-            else:
-                print(f"    ⚠️  Réponse non-image reçue (status: {response.status_code}, content-type: {response.headers.get('content-type')})")
-                
-        except Exception as e:
-            print(f"    ⚠️  Échec du téléchargement Pexels: {e}")
-        
-        # Si le téléchargement échoue, créer un avatar de fallback plus réaliste
-        print(f"    🎨 Création d'un avatar de fallback pour Pexels...")
-        from PIL import Image, ImageDraw, ImageFont
-        img = Image.new('RGBA', (400, 400), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        # Créer un avatar plus réaliste au lieu d'un simple cercle
-        # Couleur de peau réaliste
-        skin_colors = [
-            (255, 224, 189), (255, 205, 148), (234, 192, 134), (255, 173, 96),
-            (234, 153, 153), (255, 198, 140), (255, 218, 185), (255, 228, 196)
-        ]
-        skin_color = random.choice(skin_colors)
-        
-        # Dessiner la tête (ovale)
-        head_width, head_height = 200, 250
-        head_x = (400 - head_width) // 2
-        head_y = (400 - head_height) // 2
-        draw.ellipse([head_x, head_y, head_x + head_width, head_y + head_height], fill=skin_color + (255,))
-        
-        # Dessiner les yeux
-        eye_color = (random.randint(50, 150), random.randint(50, 150), random.randint(50, 150))
-        eye_size = 25
-        left_eye = (head_x + 60, head_y + 80)
-        right_eye = (head_x + 140, head_y + 80)
-        draw.ellipse([left_eye[0]-eye_size, left_eye[1]-eye_size, left_eye[0]+eye_size, left_eye[1]+eye_size], 
-                     fill=eye_color + (255,))
-        draw.ellipse([right_eye[0]-eye_size, right_eye[1]-eye_size, right_eye[0]+eye_size, right_eye[1]+eye_size], 
-                     fill=eye_color + (255,))
-        
-        # Pupilles
-        draw.ellipse([left_eye[0]-8, left_eye[1]-8, left_eye[0]+8, left_eye[1]+8], fill=(0, 0, 0, 255))
-        draw.ellipse([right_eye[0]-8, right_eye[1]-8, right_eye[0]+8, right_eye[1]+8], fill=(0, 0, 0, 255))
-        
-        # Nez
-        nose_color = tuple(int(c * 0.8) for c in skin_color) + (255,)
-        draw.ellipse([head_x + 85, head_y + 120, head_x + 115, head_y + 150], fill=nose_color)
-        
-        # Bouche
-        mouth_color = (220, 20, 60, 255)
-        draw.ellipse([head_x + 70, head_y + 160, head_x + 130, head_y + 180], fill=mouth_color)
-        
-        # Ajouter le nom en bas
-        try:
-            font = ImageFont.truetype("arial.ttf", 30)
-        except:
-            font = ImageFont.load_default()
-        
-        text_color = (255, 255, 255, 255)
-        text_bbox = draw.textbbox((0, 0), query.split()[0], font=font)
-        text_width = text_bbox[2] - text_bbox[0]
-        text_height = text_bbox[3] - text_bbox[1]
-        x = (400 - text_width) // 2
-        y = 350
-        draw.text((x, y), query.split()[0], fill=text_color, font=font)
-        
-        img.save(filename, 'PNG')
-        print(f"    ✅ Avatar Pexels créé: {filename}")
-        return True
-    except Exception as e:
-        print(f"    ❌ Erreur Pexels: {e}")
-        return False
-
-def create_realistic_avatar(name, filename, is_male=True):
-    """Crée un avatar réaliste avec un visage généré."""
-    from PIL import Image, ImageDraw, ImageFont
-    import random
-    
-    # Couleurs de peau réalistes
-    skin_colors = [
-        (255, 224, 189), (255, 205, 148), (234, 192, 134), (255, 173, 96),
-        (234, 153, 153), (255, 198, 140), (255, 218, 185), (255, 228, 196),
-        (255, 235, 205), (255, 245, 238), (245, 245, 220), (255, 250, 240)
-    ]
-    
-    # Créer une image 400x400 avec transparence
-    img = Image.new('RGBA', (400, 400), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    # Couleur de peau aléatoire
-    skin_color = random.choice(skin_colors)
-    
-    # Dessiner la tête (ovale)
-    head_width, head_height = 200, 250
-    head_x = (400 - head_width) // 2
-    head_y = (400 - head_height) // 2
-    draw.ellipse([head_x, head_y, head_x + head_width, head_y + head_height], fill=skin_color)
-    
-    # Dessiner les yeux
-    eye_color = (random.randint(50, 150), random.randint(50, 150), random.randint(50, 150))
-    eye_size = 25
-    left_eye_x = head_x + 60
-    right_eye_x = head_x + 140
-    eye_y = head_y + 100
-    draw.ellipse([left_eye_x, eye_y, left_eye_x + eye_size, eye_y + eye_size], fill=eye_color)
-    draw.ellipse([right_eye_x, eye_y, right_eye_x + eye_size, eye_y + eye_size], fill=eye_color)
-    
-    # Dessiner le nez
-    nose_x = head_x + head_width // 2
-    nose_y = eye_y + 40
-    draw.ellipse([nose_x - 10, nose_y, nose_x + 10, nose_y + 20], fill=skin_color)
-    
-    # Dessiner la bouche
-    mouth_x = nose_x
-    mouth_y = nose_y + 40
-    draw.arc([mouth_x - 20, mouth_y, mouth_x + 20, mouth_y + 15], 0, 180, fill=(139, 69, 19), width=3)
-    
-    # Dessiner les cheveux
-    hair_colors = [
-        (139, 69, 19), (160, 82, 45), (210, 105, 30), (244, 164, 96),
-        (255, 215, 0), (255, 255, 0), (255, 165, 0), (255, 0, 0),
-        (128, 0, 128), (0, 0, 255), (0, 255, 0), (255, 192, 203)
-    ]
-    hair_color = random.choice(hair_colors)
-    
-    # Style de cheveux selon le genre
-    if is_male:
-        # Cheveux courts pour les hommes
-        hair_points = [
-            (head_x - 20, head_y - 20),
-            (head_x + head_width + 20, head_y - 20),
-            (head_x + head_width + 30, head_y + 50),
-            (head_x - 30, head_y + 50)
-        ]
-    else:
-        # Cheveux longs pour les femmes
-        hair_points = [
-            (head_x - 30, head_y - 40),
-            (head_x + head_width + 30, head_y - 40),
-            (head_x + head_width + 40, head_y + 100),
-            (head_x - 40, head_y + 100)
-        ]
-    
-    draw.polygon(hair_points, fill=hair_color)
-    
-    # Ajouter le nom
-    try:
-        font = ImageFont.truetype("arial.ttf", 40)
-    except:
-        font = ImageFont.load_default()
-    
-    text = name[0].upper()
-    text_bbox = draw.textbbox((0, 0), text, font=font)
-    text_width = text_bbox[2] - text_bbox[0]
-    text_x = (400 - text_width) // 2
-    text_y = head_y + head_height + 20
-    
-    # Ombre du texte
-    draw.text((text_x + 2, text_y + 2), text, fill=(0, 0, 0, 128), font=font)
-    draw.text((text_x, text_y), text, fill=(255, 255, 255, 255), font=font)
-    
-    # Sauvegarder en PNG avec transparence
-    img.save(filename, 'PNG')
-    print(f"🎨 Avatar réaliste créé pour {name}: {filename}")
-    return True
-
-# --- LISTES SÉPARÉES HOMMES/FEMMES ---
-HOMMES = [
-    "Lionel Messi", "Cristiano Ronaldo", "Kylian Mbappe", "Neymar Jr", "Erling Haaland", "Karim Benzema", "Luka Modric", "Vinicius Junior", "Robert Lewandowski", "Mohamed Salah", "Antoine Griezmann", "Paulo Dybala", "Sergio Ramos", "Kevin De Bruyne", "Harry Kane", "LeBron James", "Stephen Curry", "Giannis Antetokounmpo", "Novak Djokovic", "Rafael Nadal", "Roger Federer", "Conor McGregor", "Khabib Nurmagomedov", "Mike Tyson", "Floyd Mayweather", "Usain Bolt", "Lewis Hamilton", "Michael Jordan", "IShowSpeed", "Ninja gamer", "xQc", "PewDiePie", "Squeezie", "MrBeast", "Dream Minecraft", "Markiplier", "Ludwig Ahgren", "SypherPK", "TimTheTatman", "TommyInnit", "Drake", "Travis Scott", "The Weeknd", "Eminem", "Kanye West", "Justin Bieber", "Ed Sheeran", "Post Malone", "Logan Paul", "Jake Paul", "Elon Musk", "Jeff Bezos", "Mark Zuckerberg", "Donald Trump", "Vladimir Putin", "Jordan Peterson", "Joe Rogan", "Ben Shapiro", "Spider Man", "Iron Man", "Captain America", "Batman", "Superman", "Deadpool", "Thanos", "Black Panther", "Naruto Uzumaki", "Sasuke Uchiha", "Son Goku", "Vegeta", "Monkey D Luffy", "Roronoa Zoro", "Eren Yeager", "Levi Ackerman", "Saitama One Punch Man", "Gojo Satoru", "Tanjiro Kamado", "Light Yagami", "L Death Note", "Shinji Ikari", "Noah Beck", "Brent Rivera", "Mr Fresh Asian", "Brent Faiyaz", "Harry Styles", "BTS Jungkook", "BTS Jimin", "BTS V Taehyung", "Maluma", "Cristiano Ronaldo Jr", "Lionel Messi Jr", "Barack Obama", "Prince Harry", "Zayn Malik", "Mario Nintendo", "Luigi Nintendo", "Sonic the Hedgehog", "Knuckles Sonic", "Tails Sonic", "Lara Croft", "Master Chief Halo", "Kratos God of War", "Atreus God of War", "Link Legend of Zelda", "Ganondorf Zelda", "Will Smith", "Chris Rock", "Keanu Reeves", "Jason Momoa", "David Schwimmer", "Zlatan Ibrahimovic", "Andrea Pirlo", "Francesco Totti", "Ronaldinho", "David Beckham", "Eden Hazard", "Mesut Ozil", "Alexis Sanchez", "Canelo Alvarez", "Tyson Fury"
-]
-FEMMES = [
-    "Serena Williams", "Naomi Osaka", "Pokimane", "Amouranth", "Valkyrae", "Taylor Swift", "Beyonce", "Rihanna", "Billie Eilish", "Doja Cat", "Dua Lipa", "Olivia Rodrigo", "Zendaya", "Scarlett Johansson", "Margot Robbie", "Jennifer Lawrence", "Anne Hathaway", "Greta Thunberg", "Amber Heard", "Wonder Woman", "Nezuko Kamado", "Charli DAmelio", "Addison Rae", "Bella Poarch", "Khaby Lame", "Loren Gray", "Avani Gregg", "Dixie DAmelio", "Nikkie Tutorials", "James Charles", "Shakira", "Adele", "Ariana Grande", "Cardi B", "Nicki Minaj", "Lisa Blackpink", "Jennie Blackpink", "Rose Blackpink", "Jisoo Blackpink", "Anitta", "Oprah Winfrey", "Michelle Obama", "Meghan Markle", "Kim Kardashian", "Kylie Jenner", "Kendall Jenner", "Gigi Hadid", "Bella Hadid", "Paris Hilton", "Selena Gomez", "Princess Peach", "Zelda Princess", "Samus Aran", "Jada Pinkett Smith", "Gal Gadot", "Millie Bobby Brown", "Sadie Sink", "Courteney Cox", "Lisa Kudrow", "Matt LeBlanc", "Naomi Scott", "Emma Watson", "Emma Stone", "Florence Pugh", "Natalie Portman", "Jessica Alba", "Eva Mendes", "Mila Kunis", "Kate Winslet", "Angelina Jolie", "Reese Witherspoon", "Julia Roberts", "Sandra Bullock", "Anne Curtis", "Priyanka Chopra", "Deepika Padukone", "Alia Bhatt", "Kriti Sanon", "Anushka Sharma", "Halle Berry", "Monica Bellucci", "Salma Hayek", "Penelope Cruz", "Cameron Diaz", "Kristen Stewart", "Kirsten Dunst", "Dakota Johnson", "Lily Collins", "Sofia Vergara", "Megan Fox", "Halsey", "Katy Perry", "Ellie Goulding", "Charli XCX", "Camila Cabello", "Lauren Jauregui", "Normani", "Becky G", "Tini Stoessel", "Madison Beer", "Hailee Steinfeld", "Lana Del Rey", "Kacey Musgraves", "Sabrina Carpenter"
-]
-
-# --- LISTE COMBINÉE POUR LA SÉLECTION ALÉATOIRE ---
-PERSONNALITIES = HOMMES + FEMMES
-
-# --- DEMANDE DES NOMS ET TÉLÉCHARGEMENT AUTOMATIQUE ---
-def get_or_download_images():
-    img1, img2 = 'img1.png', 'img2.png'
-    tried = set()
-    for attempt in range(15):
-        # Sélectionner un homme et une femme au lieu de deux personnes aléatoires
-        n1 = random.choice(HOMMES)
-        n2 = random.choice(FEMMES)
-        if (n1, n2) in tried or (n2, n1) in tried:
-            continue
-        tried.add((n1, n2))
-        
-        print(f"🔍 Tentative {attempt + 1}/15: Recherche d'images pour {n1} et {n2}")
-        
-        # Essayer plusieurs sources pour l'homme
-        ok1 = False
-        if not ok1:
-            print(f"  📥 Téléchargement Wikimedia pour {n1}...")
-            ok1 = download_wikimedia_image(n1, img1)
-        if not ok1:
-            print(f"  📥 Téléchargement Unsplash pour {n1}...")
-            ok1 = download_unsplash_image(n1, img1)
-        if not ok1:
-            print(f"  📥 Téléchargement Pixabay pour {n1}...")
-            ok1 = download_pixabay_image(n1, img1)
-        if not ok1:
-            print(f"  📥 Téléchargement Pexels pour {n1}...")
-            ok1 = download_pexels_image(n1, img1)
-        
-        # Essayer plusieurs sources pour la femme
-        ok2 = False
-        if not ok2:
-            print(f"  📥 Téléchargement Wikimedia pour {n2}...")
-            ok2 = download_wikimedia_image(n2, img2)
-        if not ok2:
-            print(f"  📥 Téléchargement Unsplash pour {n2}...")
-            ok2 = download_unsplash_image(n2, img2)
-        if not ok2:
-            print(f"  📥 Téléchargement Pixabay pour {n2}...")
-            ok2 = download_pixabay_image(n2, img2)
-        if not ok2:
-            print(f"  📥 Téléchargement Pexels pour {n2}...")
-            ok2 = download_pexels_image(n2, img2)
-        
-        # Si toujours rien, créer des avatars réalistes
-        if not ok1:
-            print(f"  🎨 Création d'un avatar réaliste pour {n1}...")
-            ok1 = create_realistic_avatar(n1, img1, is_male=True)
-        if not ok2:
-            print(f"  🎨 Création d'un avatar réaliste pour {n2}...")
-            ok2 = create_realistic_avatar(n2, img2, is_male=False)
-        
-        if ok1 and ok2:
-            print(f"✅ Images trouvées/créées pour {n1} et {n2}")
-            return img1, img2, n1.upper(), n2.upper()
-        else:
-            print(f"⚠️  Impossible de trouver/créer des images pour {n1} ou {n2}, nouvelle tentative...")
-    
-    # Dernière tentative avec des avatars réalistes
-    print("🔄 Dernière tentative avec des avatars réalistes...")
-    n1 = random.choice(HOMMES)
-    n2 = random.choice(FEMMES)
-    create_realistic_avatar(n1, img1, is_male=True)
-    create_realistic_avatar(n2, img2, is_male=False)
-    return img1, img2, n1.upper(), n2.upper()
-
-# --- UTILISATION DES IMAGES AUTOMATIQUES ---
-IMG1_PATH, IMG2_PATH, IMG1_NAME, IMG2_NAME = get_or_download_images()
-
-# Initialiser pygame correctement
-pygame.init()
-# Créer une surface virtuelle pour éviter l'erreur "No video mode has been set"
-pygame.display.set_mode((1, 1), pygame.NOFRAME)
-screen = pygame.Surface((CFG.WIDTH, CFG.HEIGHT))
-clock = pygame.time.Clock()
-FONT_LARGE  = pygame.font.SysFont(None, 120)
-FONT_MEDIUM = pygame.font.SysFont(None, 80)
-FONT_SMALL  = pygame.font.SysFont(None, 60)
-
-def load_or_fallback(name, color):
-    """Charge une image avec gestion robuste des erreurs et conversion automatique."""
-    try:
-        # Essayer de charger l'image avec pygame
-        img = pygame.image.load(name).convert_alpha()
-        print(f"✅ Image chargée avec succès: {name}")
-        return pygame.transform.smoothscale(img, (80, 80))
-    except Exception as e:
-        print(f"⚠️  Erreur lors du chargement de {name}: {e}")
-        # Créer un avatar de fallback
-        img = pygame.Surface((80, 80), pygame.SRCALPHA)
-        img.fill(color)
-        # Ajouter la première lettre du nom
-        try:
-            font = pygame.font.SysFont(None, 40)
-            text = font.render(name.split('/')[-1].split('.')[0][0].upper(), True, (255, 255, 255))
-            text_rect = text.get_rect(center=(40, 40))
-            img.blit(text, text_rect)
-        except:
-            pass
-        return img
-
-img1 = load_or_fallback(IMG1_PATH, CFG.COLORS['p1'])
-img2 = load_or_fallback(IMG2_PATH, CFG.COLORS['p2'])
-
-# =========================
-# Système de particules
-# =========================
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x; self.y = y
-        self.vx = random.uniform(-4, 4)
-        self.vy = random.uniform(-4, 4)
-        self.color = color
-        self.life = 32
-        self.max_life = 32
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.life -= 1
-        self.vy += 0.12
-    def draw(self, surface):
-        if self.life <= 0:
-            return
-        size = max(1, int(6 * (self.life / self.max_life)))
-        pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), size)
-
-# =========================
-# Entités du jeu
-# =========================
-class Player:
-    def __init__(self, x, y, img, color, name, cfg):
-        self.cfg = cfg
-        self.pos = pygame.Vector2(x, y)
-        self.vel = pygame.Vector2(0, 0)
-        self.img = img
-        self.color = color
-        self.name = name
-        self.radius = 40
-        self.score = 0
-        self.particles = []
-        self.special_ready = True
-        self.special_cooldown = 0
-        self.anim = 0
-        self.power_boost = 1.0
-    def auto_control(self, tick_mod):
-        if tick_mod % 10 == 0:
-            self.vel.x += random.uniform(-6, 6)
-            self.vel.y += random.uniform(-6, 6)
-            self.vel.x = max(-12, min(12, self.vel.x))
-            self.vel.y = max(-12, min(12, self.vel.y))
-        if tick_mod % 40 == 0 and random.random() < 0.18:
-            self.special_attack()
-    def special_attack(self):
-        if self.special_ready and self.special_cooldown <= 0:
-            self.special_ready = False
-            self.special_cooldown = 40
-            self.power_boost = 3.0
-            for _ in range(32 if self.cfg.COLORFUL_PARTICLES else 20):
-                color = tuple(random.randint(100,255) for _ in range(3)) if self.cfg.COLORFUL_PARTICLES else self.color
-                self.particles.append(Particle(self.pos.x, self.pos.y, color))
-            return True
-        return False
-    def update(self):
-        self.vel *= 0.87
-        self.pos += self.vel * self.power_boost * (1.7 if self.cfg.ULTRA_FAST else 1)
-        self.pos.x = max(self.radius, min(self.cfg.WIDTH - self.radius, self.pos.x))
-        self.pos.y = max(self.radius, min(self.cfg.HEIGHT - self.radius, self.pos.y))
-        if abs(self.vel.x) > 2 or abs(self.vel.y) > 2:
-            color = tuple(random.randint(100,255) for _ in range(3)) if self.cfg.COLORFUL_PARTICLES else self.color
-            for _ in range(2 if self.cfg.ULTRA_FAST else 1):
-                self.particles.append(Particle(self.pos.x, self.pos.y, color))
-        self.particles = [p for p in self.particles if p.life > 0]
-        for p in self.particles:
-            p.update()
-        if self.special_cooldown > 0:
-            self.special_cooldown -= 1
-        elif not self.special_ready:
-            self.special_ready = True
-            self.power_boost = 1.0
-        self.anim += 1
-    def draw(self, surface, score_flash=False):
-        for p in self.particles:
-            p.draw(surface)
-        # Halo lumineux
-        if self.cfg.HALO:
-            for i in range(6, 0, -1):
-                alpha = max(10, 40 - i * 6)
-                halo = pygame.Surface((self.radius*2.5, self.radius*2.5), pygame.SRCALPHA)
-                pygame.draw.circle(halo, (*self.color, alpha), (self.radius, self.radius), int(self.radius*1.1 + i*2))
-                surface.blit(halo, (self.pos.x - self.radius, self.pos.y - self.radius), special_flags=pygame.BLEND_RGBA_ADD)
-        # Zoom/impulsion
-        pulse = 1 + 0.22 * math.sin(self.anim * 0.5) if self.cfg.ZOOM else 1 + 0.08 * math.sin(self.anim * 0.25)
-        scaled = pygame.transform.smoothscale(
-            self.img, (int(80 * pulse), int(80 * pulse))
-        )
-        if self.special_cooldown > 30:
-            pygame.draw.circle(surface, self.color, (int(self.pos.x), int(self.pos.y)), self.radius + 10, 3)
-        surface.blit(
-            scaled,
-            (self.pos.x - scaled.get_width() // 2, self.pos.y - scaled.get_height() // 2)
-        )
-
-class Ball:
-    def __init__(self, x, y, cfg):
-        self.cfg = cfg
-        self.pos = pygame.Vector2(x, y)
-        self.vel = pygame.Vector2(random.uniform(-8, 8), random.uniform(-8, 8))
-        self.radius = 14
-        self.color = cfg.COLORS['accent']
-        self.trail = []
-    def update(self):
-        self.pos += self.vel * (1.6 if self.cfg.ULTRA_FAST else 1)
-        if self.pos.x < self.radius or self.pos.x > self.cfg.WIDTH - self.radius:
-            self.vel.x *= -1.18 if self.cfg.ULTRA_FAST else -1
-        if self.pos.y < self.radius or self.pos.y > self.cfg.HEIGHT - self.radius:
-            self.vel.y *= -1.18 if self.cfg.ULTRA_FAST else -1
-        self.trail.append(self.pos.copy())
-        if len(self.trail) > (22 if self.cfg.ULTRA_FAST else 10):
-            self.trail.pop(0)
-    def draw(self, surface):
-        for i, p in enumerate(self.trail):
-            size = max(2, int(self.radius * (i / len(self.trail)) * (1.7 if self.cfg.PARTICLE_BOOST else 1)))
-            pygame.draw.circle(surface, self.color, (int(p.x), int(p.y)), size)
-        pygame.draw.circle(surface, self.color, (int(self.pos.x), int(self.pos.y)), self.radius)
-
-# =========================
-# Jeu principal
-# =========================
-class Game:
-    def __init__(self, cfg):
-        self.cfg = cfg
-        self.p1 = Player(cfg.WIDTH // 4, cfg.HEIGHT // 2, img1, cfg.COLORS['p1'], IMG1_NAME, cfg)
-        self.p2 = Player(3 * cfg.WIDTH // 4, cfg.HEIGHT // 2, img2, cfg.COLORS['p2'], IMG2_NAME, cfg)
-        self.ball = Ball(cfg.WIDTH // 2, cfg.HEIGHT // 2, cfg)
-        self.frame_index = 0
-        self.state = "playing"
-        self.winner = None
-        # Effets visuels
-        self.shake_offset = [0, 0]
-        self.flash_alpha = 0
-        self.score_flash_timer = 0
-        self.score_flash_color = (255,255,255)
-    def check_collisions(self):
-        for pl in [self.p1, self.p2]:
-            if (self.ball.pos - pl.pos).length() < (pl.radius + self.ball.radius):
-                direction = (self.ball.pos - pl.pos)
-                if direction.length() == 0:
-                    direction = pygame.Vector2(1, 0)
-                direction = direction.normalize()
-                self.ball.vel = direction * (28 if self.cfg.ULTRA_FAST else 15)
-                pl.score += 1
-                for _ in range(36 if self.cfg.COLORFUL_PARTICLES else 18):
-                    color = tuple(random.randint(100,255) for _ in range(3)) if self.cfg.COLORFUL_PARTICLES else pl.color
-                    pl.particles.append(Particle(self.ball.pos.x, self.ball.pos.y, color))
-                pl.anim += 18
-                if self.cfg.FLASH:
-                    self.flash_alpha = self.cfg.FLASH_INTENSITY
-                if self.cfg.SHAKE:
-                    self.shake_offset[0] = random.randint(-self.cfg.SHAKE_INTENSITY,self.cfg.SHAKE_INTENSITY)
-                    self.shake_offset[1] = random.randint(-self.cfg.SHAKE_INTENSITY,self.cfg.SHAKE_INTENSITY)
-                self.score_flash_timer = self.cfg.SCORE_FLASH_DURATION
-                self.score_flash_color = tuple(random.randint(180,255) for _ in range(3))
-                # Effet sonore (si pygame.mixer dispo)
-                try:
-                    pygame.mixer.init()
-                    beep = pygame.mixer.Sound(pygame.sndarray.make_sound(np.array([4096*math.sin(2.0*math.pi*440*x/44100) for x in range(0,4410)]).astype(np.int16)))
-                    beep.play()
-                except:
-                    pass
-    def update(self):
-        self.frame_index += 1
-        self.p1.auto_control(self.frame_index)
-        self.p2.auto_control(self.frame_index)
-        self.p1.update()
-        self.p2.update()
-        self.ball.update()
-        self.check_collisions()
-        if self.shake_offset[0] != 0 or self.shake_offset[1] != 0:
-            self.shake_offset[0] = int(self.shake_offset[0]*0.7)
-            self.shake_offset[1] = int(self.shake_offset[1]*0.7)
-            if abs(self.shake_offset[0]) < 2: self.shake_offset[0]=0
-            if abs(self.shake_offset[1]) < 2: self.shake_offset[1]=0
-        if self.flash_alpha > 0:
-            self.flash_alpha = int(self.flash_alpha*0.85)
-        if self.score_flash_timer > 0:
-            self.score_flash_timer -= 1
-        if self.p1.score >= self.cfg.WIN_SCORE or self.p2.score >= self.cfg.WIN_SCORE:
-            self.state = "game_over"
-            self.winner = self.p1.name if self.p1.score >= self.cfg.WIN_SCORE else self.p2.name
-    def draw_background(self, surface):
-        for y in range(0, self.cfg.HEIGHT, 4):
-            ratio = y / self.cfg.HEIGHT
-            r = int(15 + 20 * ratio)
-            g = int(15 + 30 * ratio)
-            b = int(35 + 40 * ratio)
-            pygame.draw.rect(surface, (r, g, b), (0, y, self.cfg.WIDTH, 4))
-        for x in range(0, self.cfg.WIDTH, 50):
-            pygame.draw.line(surface, (50, 50, 70), (x, 0), (x, self.cfg.HEIGHT), 1)
-        for y in range(0, self.cfg.HEIGHT, 50):
-            pygame.draw.line(surface, (50, 50, 70), (0, y), (self.cfg.WIDTH, y), 1)
-    def draw_ui(self, surface):
-        # Scores (pulse animé + flash couleur)
-        s_pulse = 1.3 if self.cfg.SCORE_PULSE and self.p1.anim > 0 else 1.0
-        m_pulse = 1.3 if self.cfg.SCORE_PULSE and self.p2.anim > 0 else 1.0
-        s_col = self.score_flash_color if self.score_flash_timer > 0 else self.cfg.COLORS['p1']
-        m_col = self.score_flash_color if self.score_flash_timer > 0 else self.cfg.COLORS['p2']
-        s_score = pygame.transform.smoothscale(FONT_LARGE.render(f"{self.p1.score}", True, s_col), (int(120*s_pulse), int(120*s_pulse)))
-        m_score = pygame.transform.smoothscale(FONT_LARGE.render(f"{self.p2.score}", True, m_col), (int(120*m_pulse), int(120*m_pulse)))
-        surface.blit(s_score, (self.cfg.WIDTH // 4 - s_score.get_width() // 2, 100))
-        surface.blit(m_score, (3 * self.cfg.WIDTH // 4 - m_score.get_width() // 2, 100))
-        # Noms dynamiques
-        s_name = FONT_MEDIUM.render(self.p1.name, True, self.cfg.COLORS['text'])
-        m_name = FONT_MEDIUM.render(self.p2.name, True, self.cfg.COLORS['text'])
-        surface.blit(s_name, (self.cfg.WIDTH // 4 - s_name.get_width() // 2, 50))
-        surface.blit(m_name, (3 * self.cfg.WIDTH // 4 - m_name.get_width() // 2, 50))
-        pygame.draw.line(surface, self.cfg.COLORS['text'], (self.cfg.WIDTH // 2, 0), (self.cfg.WIDTH // 2, self.cfg.HEIGHT), 3)
-        # Titre overlay au début
-        if self.frame_index < self.cfg.TITLE_DURATION * self.cfg.FPS:
-            title1 = FONT_LARGE.render(f"{self.p1.name} vs {self.p2.name}", True, self.cfg.COLORS['accent'])
-            title2 = FONT_MEDIUM.render("DUEL HYPNOTIQUE !", True, self.cfg.COLORS['text'])
-            cx = self.cfg.WIDTH // 2
-            cy = self.cfg.HEIGHT // 2
-            surface.blit(title1, (cx - title1.get_width() // 2, cy - 100))
-            surface.blit(title2, (cx - title2.get_width() // 2, cy - 10))
-        # Game over overlay
-        if self.state == "game_over":
-            overlay = pygame.Surface((self.cfg.WIDTH, self.cfg.HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 140))
-            surface.blit(overlay, (0, 0))
-            winner = FONT_LARGE.render(f"{self.winner} WINS!", True, self.cfg.COLORS['accent'])
-            surface.blit(winner, (self.cfg.WIDTH // 2 - winner.get_width() // 2, self.cfg.HEIGHT // 2 - 80))
-    def render_frame(self, surface):
-        # Décalage shake
-        if self.cfg.SHAKE and (self.shake_offset[0] or self.shake_offset[1]):
-            temp = pygame.Surface((self.cfg.WIDTH, self.cfg.HEIGHT))
-            self.draw_background(temp)
-            self.ball.draw(temp)
-            self.p1.draw(temp)
-            self.p2.draw(temp)
-            self.draw_ui(temp)
-            surface.blit(temp, (self.shake_offset[0], self.shake_offset[1]))
-        else:
-            self.draw_background(surface)
-            self.ball.draw(surface)
-            self.p1.draw(surface)
-            self.p2.draw(surface)
-            self.draw_ui(surface)
-        # Flash d'écran
-        if self.cfg.FLASH and self.flash_alpha > 0:
-            flash = pygame.Surface((self.cfg.WIDTH, self.cfg.HEIGHT), pygame.SRCALPHA)
-            flash.fill((255,255,255,self.flash_alpha))
-            surface.blit(flash, (0,0))
-
-# =========================
-# Audio : musique auto (beat synthé)
-# =========================
-def make_music(t_array):
-    bpm = 120.0
-    beat_t = 60.0 / bpm
-    t = t_array
-    kick_env = np.exp(-t % beat_t * 12.0)
-    kick = np.sin(2 * np.pi * 50 * t) * kick_env
-    beat_idx = np.floor((t / beat_t) % 4)
-    snare_gate = ((beat_idx == 1) | (beat_idx == 3)).astype(float)
-    snare = snare_gate * (np.random.uniform(-1, 1, size=t.shape) * np.exp(-((t % beat_t) * 20)))
-    hat_gate = ((np.floor((t / (beat_t / 2)) % 2)) == 0).astype(float)
-    hat = hat_gate * (np.random.uniform(-1, 1, size=t.shape) * 0.3) * np.exp(-((t % (beat_t / 2)) * 40))
-    note_period = 2.0
-    note_idx = np.floor(t / note_period) % 4
-    freqs = np.array([55, 65.4, 73.4, 82.4])
-    f = freqs[note_idx.astype(int)]
-    bass = 0.2 * np.sin(2 * np.pi * f * t) * np.exp(-((t % note_period) * 0.6))
-    mix = kick * 0.8 + snare * 0.5 + hat * 0.3 + bass * 0.9
-    mix = np.tanh(mix * 1.5).astype(np.float32)
-    return mix
-
-def music_frame(t):
-    if np.isscalar(t):
-        t = np.array([t], dtype=np.float32)
-    return make_music(t)
-
-# =========================
-# Pipeline rendu (frames -> PNG -> vidéo)
-# =========================
-def render_video():
-    if CFG.FRAMES_DIR.exists():
-        shutil.rmtree(CFG.FRAMES_DIR)
-    CFG.FRAMES_DIR.mkdir(parents=True, exist_ok=True)
-    game = Game(CFG)
-    total_frames = int(CFG.DURATION * CFG.FPS)
-    print("🎮 Génération en cours...")
-    
-    # Utiliser OpenCV au lieu de MoviePy
-    output_filename = CFG.OUTPUT_FILE
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(output_filename, fourcc, CFG.FPS, (CFG.WIDTH, CFG.HEIGHT))
-    
-    for i in range(total_frames):
-        game.update()
-        game.render_frame(screen)
-        
-        # Convertir pygame surface en array OpenCV
-        frame_array = pygame.surfarray.array3d(screen)
-        frame_array = np.transpose(frame_array, (1, 0, 2))
-        frame_array = cv2.cvtColor(frame_array, cv2.COLOR_RGB2BGR)
-        
-        out.write(frame_array)
-        
-        if i % max(1, total_frames // 10) == 0:
-            pct = (i / total_frames) * 100
-            print(f"📊 Progression: {pct:.0f}%")
-    
-    out.release()
-    
-    try:
-        shutil.rmtree(CFG.FRAMES_DIR)
-    except Exception:
-        pass
-    
-    print(f"✅ Vidéo créée : {output_filename}")
-    print("🚀 Prêt pour TikTok / Shorts / Reels.")
-
-def blend_images(img_path1, img_path2, out_path):
-    from PIL import Image, ImageDraw
-    
-    # Fonction pour créer un avatar de fallback
-    def create_fallback_avatar(name, color):
-        im = Image.new('RGBA', (400, 400), color)
-        d = ImageDraw.Draw(im)
-        # Dessiner un cercle pour la tête
-        d.ellipse([50, 50, 350, 350], fill=(255, 255, 255, 100))
-        # Ajouter la première lettre du nom
-        try:
-            # Essayer d'utiliser une police plus grande
-            font_size = 120
-            d.text((200, 180), name[0].upper(), fill=(255, 255, 255, 255), anchor="mm")
-        except:
-            # Fallback si la police échoue
-            d.text((150, 150), name[0].upper(), fill=(255, 255, 255, 255))
-        return im
-    
-    # Charger ou créer les images
-    try:
-        im1 = Image.open(img_path1).convert('RGBA').resize((400, 400))
-    except:
-        # Créer un avatar de fallback pour l'homme
-        color1 = (random.randint(100, 200), random.randint(50, 150), random.randint(50, 150), 255)
-        im1 = create_fallback_avatar("H", color1)
-    
-    try:
-        im2 = Image.open(img_path2).convert('RGBA').resize((400, 400))
-    except:
-        # Créer un avatar de fallback pour la femme
-        color2 = (random.randint(150, 255), random.randint(100, 200), random.randint(150, 255), 255)
-        im2 = create_fallback_avatar("F", color2)
-    
-    # Fusionner les images
-    blended = Image.blend(im1, im2, alpha=0.5)
-    blended.save(out_path)
-    return blended
-
-def fusion_children_mode():
-    couples = []
-    used = set()
-    while len(couples) < 10:
-        h = random.choice(HOMMES)
-        f = random.choice(FEMMES)
-        if (h, f) in used:
-            continue
-        used.add((h, f))
-        couples.append((h, f))
-    children_paths = []
-    for idx, (n1, n2) in enumerate(couples, 1):
-        print(f"\n👩‍❤️‍👨 Couple {idx}: {n1} + {n2}")
-        img1, img2 = f"parent1_{idx}.png", f"parent2_{idx}.png"
-        ok1 = download_wikimedia_image(n1, img1) or download_unsplash_image(n1, img1)
-        ok2 = download_wikimedia_image(n2, img2) or download_unsplash_image(n2, img2)
-        if not ok1:
-            from PIL import Image, ImageDraw
-            im = Image.new('RGBA', (400,400), (random.randint(100,255),random.randint(100,255),random.randint(100,255),255))
-            d = ImageDraw.Draw(im)
-            d.text((100,180), n1[0], fill=(255,255,255,255))
-            im.save(img1)
-        if not ok2:
-            from PIL import Image, ImageDraw
-            im = Image.new('RGBA', (400,400), (random.randint(100,255),random.randint(100,255),random.randint(100,255),255))
-            d = ImageDraw.Draw(im)
-            d.text((100,180), n2[0], fill=(255,255,255,255))
-            im.save(img2)
-        child_path = f"child_{idx}.png"
-        blend_images(img1, img2, child_path)
-        children_paths.append((child_path, n1, n2))
-    # Affichage et choix du plus beau
-    from PIL import Image
-    import matplotlib.pyplot as plt
-    fig, axs = plt.subplots(2, 5, figsize=(20,8))
-    for i, (child_path, n1, n2) in enumerate(children_paths):
-        ax = axs[i//5, i%5]
-        ax.imshow(Image.open(child_path))
-        ax.set_title(f"{n1} + {n2}")
-        ax.axis('off')
-    winner = random.choice(children_paths)
-    plt.suptitle(f"L'enfant le plus beau : {winner[1]} + {winner[2]} !", fontsize=24, color='gold')
-    plt.tight_layout()
-    plt.show()
-
-def cartoon_fusion_video():
-    WIDTH, HEIGHT = CFG.WIDTH, CFG.HEIGHT
-    FPS = 50
-    DURATION = 63
-    FRAMES_PER_COUPLE = int(FPS * (DURATION/5))
-    couples = []
-    used = set()
-    while len(couples) < 5:
-        h = random.choice(HOMMES)
-        f = random.choice(FEMMES)
-        if (h, f) in used:
-            continue
-        used.add((h, f))
-        couples.append((h, f))
-    all_frames = []
-    baby_imgs = []
-    for idx, (n1, n2) in enumerate(couples, 1):
-        print(f"\n🎬 Cartoon couple {idx}: {n1} + {n2}")
-        img1, img2 = f"parent1_{idx}.png", f"parent2_{idx}.png"
-        
-        # Télécharger ou créer des avatars réalistes
-        print(f"  📥 Téléchargement des images pour {n1} et {n2}...")
-        
-        ok1 = False
-        if not ok1:
-            print(f"  🔍 Essai Wikimedia pour {n1}...")
-            ok1 = download_wikimedia_image(n1, img1)
-        if not ok1:
-            print(f"  🔍 Essai Unsplash pour {n1}...")
-            ok1 = download_unsplash_image(n1, img1)
-        if not ok1:
-            print(f"  🔍 Essai Pixabay pour {n1}...")
-            ok1 = download_pixabay_image(n1, img1)
-        if not ok1:
-            print(f"  🔍 Essai Pexels pour {n1}...")
-            ok1 = download_pexels_image(n1, img1)
-        if not ok1:
-            print(f"  🎨 Création d'un avatar réaliste pour {n1}...")
-            ok1 = create_realistic_avatar(n1, img1, is_male=True)
-        
-        ok2 = False
-        if not ok2:
-            print(f"  🔍 Essai Wikimedia pour {n2}...")
-            ok2 = download_wikimedia_image(n2, img2)
-        if not ok2:
-            print(f"  🔍 Essai Unsplash pour {n2}...")
-            ok2 = download_unsplash_image(n2, img2)
-        if not ok2:
-            print(f"  🔍 Essai Pixabay pour {n2}...")
-            ok2 = download_pixabay_image(n2, img2)
-        if not ok2:
-            print(f"  🔍 Essai Pexels pour {n2}...")
-            ok2 = download_pexels_image(n2, img2)
-        if not ok2:
-            print(f"  🎨 Création d'un avatar réaliste pour {n2}...")
-            ok2 = create_realistic_avatar(n2, img2, is_male=False)
-        
-        # Génère le bébé fusionné
-        child_path = f"child_{idx}.png"
-        blend_images(img1, img2, child_path)
-        baby_imgs.append((child_path, n1, n2))
-        
-        # Animation cartoon (frames)
-        frames = []
-        try:
-            # Charger les images avec PIL puis convertir en numpy array
-            from PIL import Image
-            import numpy as np
-            
-            # Charger l'avatar 1
-            pil_img1 = Image.open(img1).convert('RGBA')
-            pil_img1 = pil_img1.resize((400, 400), Image.Resampling.LANCZOS)
-            avatar1 = np.array(pil_img1)
-            print(f"  ✅ Avatar 1 chargé: {avatar1.shape}")
-        except Exception as e:
-            print(f"  ⚠️  Erreur lors du chargement de {img1}: {e}")
-            # Créer un avatar de fallback pour l'homme
-            avatar1 = np.zeros((400, 400, 4), dtype=np.uint8)
-            color1 = (random.randint(100, 200), random.randint(50, 150), random.randint(50, 150), 255)
-            cv2.circle(avatar1, (200, 200), 150, color1, -1)
-            cv2.putText(avatar1, n1[0].upper(), (150, 220), cv2.FONT_HERSHEY_SIMPLEX, 3, (255, 255, 255, 255), 5)
-        
-        try:
-            # Charger l'avatar 2
-            pil_img2 = Image.open(img2).convert('RGBA')
-            pil_img2 = pil_img2.resize((400, 400), Image.Resampling.LANCZOS)
-            avatar2 = np.array(pil_img2)
-            print(f"  ✅ Avatar 2 chargé: {avatar2.shape}")
-        except Exception as e:
-            print(f"  ⚠️  Erreur lors du chargement de {img2}: {e}")
-            # Créer un avatar de fallback pour la femme
-            avatar2 = np.zeros((400, 400, 4), dtype=np.uint8)
-            color2 = (random.randint(150, 255), random.randint(100, 200), random.randint(150, 255), 255)
-            cv2.circle(avatar2, (200, 200), 150, color2, -1)
-            cv2.putText(avatar2, n2[0].upper(), (150, 220), cv2.FONT_HERSHEY_SIMPLEX, 3, (255, 255, 255, 255), 5)
-        
-        try:
-            # Charger le bébé
-            pil_baby = Image.open(child_path).convert('RGBA')
-            pil_baby = pil_baby.resize((400, 400), Image.Resampling.LANCZOS)
-            baby = np.array(pil_baby)
-            print(f"  ✅ Bébé chargé: {baby.shape}")
-        except Exception as e:
-            print(f"  ⚠️  Erreur lors du chargement de {child_path}: {e}")
-            # Créer un bébé de fallback
-            baby = np.zeros((400, 400, 4), dtype=np.uint8)
-            color_baby = (random.randint(150, 255), random.randint(150, 255), random.randint(150, 255), 255)
-            cv2.circle(baby, (200, 200), 150, color_baby, -1)
-            cv2.putText(baby, "B", (150, 220), cv2.FONT_HERSHEY_SIMPLEX, 3, (255, 255, 255, 255), 5)
-        
-        for t in range(FRAMES_PER_COUPLE):
-            frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
-            
-            # Entrée rapide (0-0.7s)
-            if t < FPS*0.7:
-                x1 = int(-200 + (WIDTH//2-120+30)*(t/(FPS*0.7)))
-                x2 = int(WIDTH+200 - (WIDTH//2-120+30)*(t/(FPS*0.7)))
-                y = HEIGHT//2-100
-                # Vérifier que les coordonnées sont valides
-                if 0 <= x1 < WIDTH-400 and 0 <= y < HEIGHT-400:
-                    # Convertir RGBA en RGB pour l'affichage
-                    if avatar1.shape[2] == 4:
-                        # Créer un masque alpha
-                        alpha = avatar1[:, :, 3:4] / 255.0
-                        rgb = avatar1[:, :, :3]
-                        # Appliquer l'alpha sur le frame
-                        frame[y:y+400, x1:x1+400] = (1 - alpha) * frame[y:y+400, x1:x1+400] + alpha * rgb
-                    else:
-                        frame[y:y+400, x1:x1+400] = avatar1[:, :, :3]
-                if 0 <= x2 < WIDTH-400 and 0 <= y < HEIGHT-400:
-                    if avatar2.shape[2] == 4:
-                        alpha = avatar2[:, :, 3:4] / 255.0
-                        rgb = avatar2[:, :, :3]
-                        frame[y:y+400, x2:x2+400] = (1 - alpha) * frame[y:y+400, x2:x2+400] + alpha * rgb
-                    else:
-                        frame[y:y+400, x2:x2+400] = avatar2[:, :, :3]
-            # Poursuite (0.7-1.5s)
-            elif t < FPS*1.5:
-                x1 = int(WIDTH//2-220 + 60*math.sin(t/8))
-                x2 = int(WIDTH//2+20 - 60*math.sin(t/8))
-                y = HEIGHT//2-100
-                # Vérifier que les coordonnées sont valides
-                if 0 <= x1 < WIDTH-400 and 0 <= y < HEIGHT-400:
-                    if avatar1.shape[2] == 4:
-                        alpha = avatar1[:, :, 3:4] / 255.0
-                        rgb = avatar1[:, :, :3]
-                        frame[y:y+400, x1:x1+400] = (1 - alpha) * frame[y:y+400, x1:x1+400] + alpha * rgb
-                    else:
-                        frame[y:y+400, x1:x1+400] = avatar1[:, :, :3]
-                if 0 <= x2 < WIDTH-400 and 0 <= y < HEIGHT-400:
-                    if avatar2.shape[2] == 4:
-                        alpha = avatar2[:, :, 3:4] / 255.0
-                        rgb = avatar2[:, :, :3]
-                        frame[y:y+400, x2:x2+400] = (1 - alpha) * frame[y:y+400, x2:x2+400] + alpha * rgb
-                    else:
-                        frame[y:y+400, x2:x2+400] = avatar2[:, :, :3]
-            # Collision (1.5-2s)
-            elif t < FPS*2:
-                x = WIDTH//2-200
-                y = HEIGHT//2-100
-                # Vérifier que les coordonnées sont valides
-                if 0 <= x < WIDTH-400 and 0 <= y < HEIGHT-400:
-                    if avatar1.shape[2] == 4:
-                        alpha = avatar1[:, :, 3:4] / 255.0
-                        rgb = avatar1[:, :, :3]
-                        frame[y:y+400, x:x+400] = (1 - alpha) * frame[y:y+400, x:x+400] + alpha * rgb
-                    else:
-                        frame[y:y+400, x:x+400] = avatar1[:, :, :3]
-                if 0 <= x+80 < WIDTH-400 and 0 <= y < HEIGHT-400:
-                    if avatar2.shape[2] == 4:
-                        alpha = avatar2[:, :, 3:4] / 255.0
-                        rgb = avatar2[:, :, :3]
-                        frame[y:y+400, x+80:x+480] = (1 - alpha) * frame[y:y+400, x+80:x+480] + alpha * rgb
-                    else:
-                        frame[y:y+400, x+80:x+480] = avatar2[:, :, :3]
-                # Effet BOING
-                cv2.putText(frame, "BOING!", (WIDTH//2-100, HEIGHT//2-120), cv2.FONT_HERSHEY_TRIPLEX, 2, (255,255,0), 6)
-            # Explosion paillettes/nuage (2-2.5s)
-            elif t < FPS*2.5:
-                for _ in range(80):
-                    px = random.randint(WIDTH//2-80, WIDTH//2+80)
-                    py = random.randint(HEIGHT//2-40, HEIGHT//2+120)
-                    color = tuple(np.random.randint(150,255,3).tolist())
-                    cv2.circle(frame, (px,py), random.randint(8,18), color, -1)
-                cv2.ellipse(frame, (WIDTH//2, HEIGHT//2+100), (120,60), 0, 0, 360, (255,255,255), -1)
-                cv2.putText(frame, "POUF!", (WIDTH//2-80, HEIGHT//2-60), cv2.FONT_HERSHEY_TRIPLEX, 2, (255,0,255), 6)
-            # Bébé sort du nuage (2.5-4s)
-            elif t < FPS*4:
-                alpha = min(1, (t-FPS*2.5)/(FPS*1.5))
-                y = HEIGHT//2-40 + int(80*(1-alpha))
-                x = WIDTH//2-200
-                # Vérifier que les coordonnées sont valides
-                if 0 <= x < WIDTH-400 and 0 <= y < HEIGHT-400:
-                    if baby.shape[2] == 4:
-                        baby_alpha = baby[:, :, 3:4] / 255.0
-                        baby_rgb = baby[:, :, :3]
-                        frame[y:y+400, x:x+400] = (1 - baby_alpha) * frame[y:y+400, x:x+400] + baby_alpha * baby_rgb
-                    else:
-                        frame[y:y+400, x:x+400] = baby[:, :, :3]
-                cv2.ellipse(frame, (WIDTH//2, HEIGHT//2+100), (120,60), 0, 0, 360, (255,255,255), -1)
-                if alpha>0.7:
-                    cv2.putText(frame, "TCHAK!", (WIDTH//2-100, HEIGHT//2-120), cv2.FONT_HERSHEY_TRIPLEX, 2, (0,255,255), 6)
-            # Pause bébé (4-6s)
-            else:
-                y = HEIGHT//2-40
-                x = WIDTH//2-200
-                # Vérifier que les coordonnées sont valides
-                if 0 <= x < WIDTH-400 and 0 <= y < HEIGHT-400:
-                    if baby.shape[2] == 4:
-                        baby_alpha = baby[:, :, 3:4] / 255.0
-                        baby_rgb = baby[:, :, :3]
-                        frame[y:y+400, x:x+400] = (1 - baby_alpha) * frame[y:y+400, x:x+400] + baby_alpha * baby_rgb
-                    else:
-                        frame[y:y+400, x:x+400] = baby[:, :, :3]
-                cv2.putText(frame, f"{n1} + {n2}", (WIDTH//2-180, HEIGHT-120), cv2.FONT_HERSHEY_TRIPLEX, 1.2, (255,255,255), 3)
-            
-            all_frames.append(frame)
-    # Affichage final des 5 bébés
-    for idx, (child_path, n1, n2) in enumerate(baby_imgs, 1):
-        frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
-        try:
-            # Charger le bébé avec PIL pour gérer la transparence
-            pil_baby = Image.open(child_path).convert('RGBA')
-            pil_baby = pil_baby.resize((400, 400), Image.Resampling.LANCZOS)
-            baby = np.array(pil_baby)
-            
-            # Appliquer la transparence
-            if baby.shape[2] == 4:
-                alpha = baby[:, :, 3:4] / 255.0
-                rgb = baby[:, :, :3]
-                frame[HEIGHT//2-40:HEIGHT//2-40+400, WIDTH//2-200:WIDTH//2+200] = (1 - alpha) * frame[HEIGHT//2-40:HEIGHT//2-40+400, WIDTH//2-200:WIDTH//2+200] + alpha * rgb
-            else:
-                frame[HEIGHT//2-40:HEIGHT//2-40+400, WIDTH//2-200:WIDTH//2+200] = baby[:, :, :3]
-        except:
-            # Créer un bébé de fallback
-            baby = np.zeros((400, 400, 3), dtype=np.uint8)
-            color_baby = (random.randint(150, 255), random.randint(150, 255), random.randint(150, 255))
-            cv2.circle(baby, (200, 200), 150, color_baby, -1)
-            cv2.putText(baby, "B", (150, 220), cv2.FONT_HERSHEY_SIMPLEX, 3, (255, 255, 255), 5)
-            frame[HEIGHT//2-40:HEIGHT//2-40+400, WIDTH//2-200:WIDTH//2+200] = baby
-        cv2.putText(frame, f"{n1} + {n2}", (WIDTH//2-180, HEIGHT-120), cv2.FONT_HERSHEY_TRIPLEX, 1.2, (255,255,255), 3)
-        all_frames.extend([frame]*int(FPS*2))
-    # Annonce du plus beau
-    winner = random.choice(baby_imgs)
-    for t in range(int(FPS*3)):
-        frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
-        try:
-            # Charger le bébé gagnant avec PIL
-            pil_baby = Image.open(winner[0]).convert('RGBA')
-            pil_baby = pil_baby.resize((400, 400), Image.Resampling.LANCZOS)
-            baby = np.array(pil_baby)
-            
-            # Appliquer la transparence
-            if baby.shape[2] == 4:
-                alpha = baby[:, :, 3:4] / 255.0
-                rgb = baby[:, :, :3]
-                frame[HEIGHT//2-40:HEIGHT//2-40+400, WIDTH//2-200:WIDTH//2+200] = (1 - alpha) * frame[HEIGHT//2-40:HEIGHT//2-40+400, WIDTH//2-200:WIDTH//2+200] + alpha * rgb
-            else:
-                frame[HEIGHT//2-40:HEIGHT//2-40+400, WIDTH//2-200:WIDTH//2+200] = baby[:, :, :3]
-        except:
-            # Créer un bébé de fallback
-            baby = np.zeros((400, 400, 3), dtype=np.uint8)
-            color_baby = (random.randint(150, 255), random.randint(150, 255), random.randint(150, 255))
-            cv2.circle(baby, (200, 200), 150, color_baby, -1)
-            cv2.putText(baby, "B", (150, 220), cv2.FONT_HERSHEY_SIMPLEX, 3, (255, 255, 255), 5)
-            frame[HEIGHT//2-40:HEIGHT//2-40+400, WIDTH//2-200:WIDTH//2+200] = baby
-        cv2.putText(frame, f"Le plus beau : {winner[1]} + {winner[2]} !", (WIDTH//2-260, HEIGHT//2+220), cv2.FONT_HERSHEY_TRIPLEX, 1.3, (255,215,0), 4)
-        all_frames.append(frame)
-    # Export vidéo MP4
-    cartoon_filename = generate_viral_filename()
-    out = cv2.VideoWriter(cartoon_filename, cv2.VideoWriter_fourcc(*'mp4v'), FPS, (WIDTH, HEIGHT))
-    for f in all_frames:
-        out.write(f)
-    out.release()
-    print(f"✅ Vidéo cartoon Looney Tunes générée : {cartoon_filename}")
-
-# --- Pour activer ce mode, décommente la ligne suivante et commente le render_video() ---
 if __name__ == "__main__":
-    cartoon_fusion_video()
-    pygame.quit()
+    main()